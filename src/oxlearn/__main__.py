@@ -1,19 +1,49 @@
 import argparse
+import asyncio
 import colorama
 import datetime
 import logging
 import random
+import threading
 
 from oxlearn import __version__
 from oxlearn.board import Board
 from oxlearn.board import BoardSymbol
 from oxlearn.play import IPlayer
 from oxlearn.play import play_game
-from oxlearn.randomplayer import RandomPlayer
-from oxlearn.training import LearnPlayer
+from oxlearn.rng import SeedSequence
+from oxlearn.rng import brain_stream
+from oxlearn.server import MoveServer
+from oxlearn.server import parse_address
+from oxlearn.sprt import SPRT
+from oxlearn.sprt import format_sprt
+from oxlearn.sprt import sprt_match
+from oxlearn.tournament import PlayerSpec
+from oxlearn.tournament import format_tournament
+from oxlearn.tournament import play_match
+from oxlearn.tournament import run_tournament
+from oxlearn.tournament import players as automatic_players
 from oxlearn.training import LearnPlayerBrain
-from oxlearn.training import TrainedPlayer
+from oxlearn.training import PrioritizedSweeper
+from oxlearn.training import ReplayBuffer
+from oxlearn.training import SnapshotPublisher
+from oxlearn.training import RewardModel
+from oxlearn.training import StoppingCriterion
+from oxlearn.training import TrainingMetrics
 from oxlearn.training import training_routine
+from oxlearn.training import value_iteration
+from oxlearn.training import learners
+from oxlearn.training import sweep
+from oxlearn.training.distributed import Coordinator
+from oxlearn.training.distributed import format_stats as format_worker_stats
+from oxlearn.training.distributed import run_worker
+from oxlearn.training.evaluation import format_report
+from oxlearn.training.evaluation import policy_optimality
+from oxlearn.training.evaluation import score_against_random
+from oxlearn.training.exploration import schedules as exploration_schedules
+from oxlearn.training.merge import merge_brains
+from oxlearn.training.merge import methods as merge_methods
+from oxlearn.training.storage import storages
 
 logger = logging.getLogger("oxlearn")
 
@@ -91,9 +121,318 @@ def parse_args(available_players: list[str]) -> argparse.Namespace:
         type=int,
         help=(
             "Training mode. Overrides player-o and player-x to run the specified number"
-            " of training rounds"
+            " of training rounds, or at most that many if a stopping criterion is given"
         ),
     )
+    parser.add_argument(
+        "--value-iteration",
+        action="store_true",
+        help=(
+            "Planning mode. Computes the values self-play training converges to"
+            " directly from the game graph, using the reward, decay and exploration"
+            " settings, and writes them to the training output"
+        ),
+    )
+    parser.add_argument(
+        "--plan-tolerance",
+        action="store",
+        type=float,
+        default=1e-9,
+        help="Largest value change at which value iteration stops",
+    )
+    parser.add_argument(
+        "--planning-backups",
+        action="store",
+        type=int,
+        default=0,
+        help=(
+            "Number of prioritized sweeping backups over the states affected by"
+            " value changes to run after each played game. 0 disables them."
+            " Training mode only"
+        ),
+    )
+    parser.add_argument(
+        "--planning-threshold",
+        action="store",
+        type=float,
+        default=1e-4,
+        help=(
+            "Smallest value change that queues its dependent states for prioritized"
+            " sweeping. Training mode only"
+        ),
+    )
+    parser.add_argument(
+        "--sweep",
+        action="store",
+        type=str,
+        help=(
+            "Hyperparameter sweep mode. Trains one brain per configuration in the given"
+            " JSON grid or random search spec for --training games each, scores it by"
+            " its exact expected result against a random player, and writes the best"
+            " brain to the training output"
+        ),
+    )
+    parser.add_argument(
+        "--sweep-workers",
+        action="store",
+        type=int,
+        help="Number of worker processes for the sweep. Defaults to the CPU count",
+    )
+    parser.add_argument(
+        "--sweep-results",
+        action="store",
+        type=str,
+        help="Write the sweep results table to this CSV file",
+    )
+    parser.add_argument(
+        "--tournament",
+        action="store",
+        nargs="+",
+        metavar="PLAYER",
+        help=(
+            "Tournament mode. Plays a round robin between the given players and"
+            " prints the results and Elo ratings. A player is a player name,"
+            " optionally followed by a brain file to load, e.g. trained:brain.json"
+        ),
+    )
+    parser.add_argument(
+        "--tournament-games",
+        action="store",
+        type=int,
+        default=100,
+        help="Number of games per pairing, half with each player going first",
+    )
+    parser.add_argument(
+        "--tournament-workers",
+        action="store",
+        type=int,
+        help="Number of worker processes for the tournament. Defaults to the CPU count",
+    )
+    parser.add_argument(
+        "--serve",
+        action="store",
+        type=str,
+        metavar="HOST:PORT",
+        help=(
+            "Server mode. Answers move requests over a TCP line protocol with the"
+            " brain loaded from the training input"
+        ),
+    )
+    parser.add_argument(
+        "--snapshot-every",
+        action="store",
+        type=int,
+        default=1000,
+        help=(
+            "With --serve and --training, serve a snapshot of the brain being"
+            " trained that is refreshed every this many games"
+        ),
+    )
+    parser.add_argument(
+        "--snapshot-interval",
+        action="store",
+        type=float,
+        help=(
+            "With --serve and --training, refresh the served snapshot every this"
+            " many seconds instead"
+        ),
+    )
+    parser.add_argument(
+        "--coordinate",
+        action="store",
+        type=str,
+        metavar="HOST:PORT",
+        help=(
+            "Distributed training coordinator. Merges the value changes sent by"
+            " --worker processes into the brain until --training games have been"
+            " played, then writes it to the training output"
+        ),
+    )
+    parser.add_argument(
+        "--worker",
+        action="store",
+        type=str,
+        metavar="HOST:PORT",
+        help=(
+            "Distributed training worker. Plays self-play games for the coordinator"
+            " at the given address, using the learner and training settings"
+        ),
+    )
+    parser.add_argument(
+        "--worker-batch",
+        action="store",
+        type=int,
+        default=500,
+        help="Number of games a worker plays between reports to the coordinator",
+    )
+    parser.add_argument(
+        "--max-lag",
+        action="store",
+        type=int,
+        default=16,
+        help=(
+            "Number of versions a worker's copy of the values may fall behind the"
+            " coordinator's before its changes are rejected"
+        ),
+    )
+    parser.add_argument(
+        "--refresh-change",
+        action="store",
+        type=float,
+        default=1.0,
+        help=(
+            "Total value change merged since a worker's copy after which the"
+            " coordinator sends it fresh values"
+        ),
+    )
+    parser.add_argument(
+        "--sprt",
+        action="store",
+        nargs=2,
+        metavar="PLAYER",
+        help=(
+            "Match mode. Plays the two given players against each other, in the"
+            " same format as tournament players, until a sequential probability"
+            " ratio test decides whether the first is stronger"
+        ),
+    )
+    parser.add_argument(
+        "--sprt-elo0",
+        action="store",
+        type=float,
+        default=0.0,
+        help="Elo difference of the null hypothesis for --sprt",
+    )
+    parser.add_argument(
+        "--sprt-elo1",
+        action="store",
+        type=float,
+        default=50.0,
+        help="Elo difference of the alternative hypothesis for --sprt",
+    )
+    parser.add_argument(
+        "--sprt-alpha",
+        action="store",
+        type=float,
+        default=0.05,
+        help="False positive rate for --sprt",
+    )
+    parser.add_argument(
+        "--sprt-beta",
+        action="store",
+        type=float,
+        default=0.05,
+        help="False negative rate for --sprt",
+    )
+    parser.add_argument(
+        "--sprt-max-games",
+        action="store",
+        type=int,
+        default=10000,
+        help="Give up on --sprt without a decision after this many games",
+    )
+    parser.add_argument(
+        "--games",
+        action="store",
+        type=int,
+        help=(
+            "Play this many games between player-o and player-x without asking to"
+            " play again, then print the results"
+        ),
+    )
+    parser.add_argument(
+        "--storage",
+        choices=storages,
+        help=(
+            "How the brain holds its values: boxed floats in a dict, or compact"
+            " float32, float16 or fixed point uint16 arrays, or on disk in a SQLite"
+            " file with a cache of recently used pages. Defaults to whatever the"
+            " training input was saved with"
+        ),
+    )
+    parser.add_argument(
+        "--storage-range",
+        action="store",
+        type=float,
+        nargs=2,
+        default=[-1.0, 1.0],
+        metavar=("LOW", "HIGH"),
+        help="Range of values uint16 storage can hold",
+    )
+    parser.add_argument(
+        "--storage-path",
+        action="store",
+        type=str,
+        help="Database file for sqlite storage, which keeps values on disk",
+    )
+    parser.add_argument(
+        "--count-visits",
+        action="store_true",
+        help=(
+            "Count how many times each state's value is updated and save the counts"
+            " with the brain, for weighting it in --merge. Brains saved with counts"
+            " keep counting"
+        ),
+    )
+    parser.add_argument(
+        "--merge",
+        action="store",
+        nargs="+",
+        metavar="FILE",
+        help=(
+            "Merge mode. Combines the given brain files, one file at a time, into"
+            " the training output"
+        ),
+    )
+    parser.add_argument(
+        "--merge-method",
+        choices=merge_methods,
+        default="visits",
+        help=(
+            "How --merge combines a state's values: averaged weighted by visit"
+            " counts, or taken from the brain that visited it most"
+        ),
+    )
+    parser.add_argument(
+        "--stop-window",
+        action="store",
+        type=int,
+        default=1000,
+        help="Number of games per window for stopping criteria. Training mode only",
+    )
+    parser.add_argument(
+        "--stop-max-update",
+        action="store",
+        type=float,
+        help=(
+            "Stop training once the largest value change in a window drops below this."
+            " Training mode only"
+        ),
+    )
+    parser.add_argument(
+        "--stop-mean-update",
+        action="store",
+        type=float,
+        help=(
+            "Stop training once the mean value change in a window drops below this."
+            " Training mode only"
+        ),
+    )
+    parser.add_argument(
+        "--stop-policy-stable",
+        action="store",
+        type=int,
+        help=(
+            "Stop training once the greedy policy has been unchanged for this many"
+            " windows. Training mode only"
+        ),
+    )
+    parser.add_argument(
+        "--max-time",
+        action="store",
+        type=float,
+        help="Stop training after this many seconds. Training mode only",
+    )
     parser.add_argument(
         "--player-o",
         choices=available_players,
@@ -112,6 +451,15 @@ def parse_args(available_players: list[str]) -> argparse.Namespace:
         type=int,
         help="Set the seed for random number generation",
     )
+    parser.add_argument(
+        "--rng-state",
+        action="store",
+        type=str,
+        help=(
+            "File to restore the random number generator state from and to save it to"
+            " after training. Training mode only"
+        ),
+    )
     parser.add_argument(
         "--logfile", action="store", type=str, help="Log the run to file"
     )
@@ -128,6 +476,50 @@ def parse_args(available_players: list[str]) -> argparse.Namespace:
         default="WARNING",
         help="Minimum level to log",
     )
+    parser.add_argument(
+        "--search-budget-ms",
+        action="store",
+        type=float,
+        default=100.0,
+        help="Time budget per move in milliseconds for the search player",
+    )
+    parser.add_argument(
+        "--search-tt-size",
+        action="store",
+        type=int,
+        default=1 << 16,
+        help="Number of transposition table slots for the search player",
+    )
+    parser.add_argument(
+        "--mcts-iterations",
+        action="store",
+        type=int,
+        default=2000,
+        help="Maximum number of tree search iterations per move for the mcts player",
+    )
+    parser.add_argument(
+        "--mcts-budget-ms",
+        action="store",
+        type=float,
+        help="Time budget per move in milliseconds for the mcts player",
+    )
+    parser.add_argument(
+        "--mcts-rollouts",
+        action="store",
+        type=int,
+        default=8,
+        help="Number of random playouts per leaf evaluation for the mcts player",
+    )
+    parser.add_argument(
+        "--mcts-use-brain",
+        action="store_true",
+        help="Evaluate mcts leaves with the trained values instead of playouts",
+    )
+    parser.add_argument(
+        "--mcts-reuse",
+        action="store_true",
+        help="Keep the mcts player's search statistics between moves",
+    )
     parser.add_argument(
         "--training-input",
         action="store",
@@ -142,6 +534,48 @@ def parse_args(available_players: list[str]) -> argparse.Namespace:
         default="trainingdata.json",
         help="File to use as output for training data. Training mode only",
     )
+    parser.add_argument(
+        "--metrics-file",
+        action="store",
+        type=str,
+        help=(
+            "Append a JSON line of training metrics per window to file. Training mode"
+            " only"
+        ),
+    )
+    parser.add_argument(
+        "--metrics-every",
+        action="store",
+        type=int,
+        help="Emit training metrics every N games. Training mode only",
+    )
+    parser.add_argument(
+        "--metrics-interval",
+        action="store",
+        type=float,
+        help="Emit training metrics every T seconds. Training mode only",
+    )
+    parser.add_argument(
+        "--metrics-optimality",
+        action="store_true",
+        help=(
+            "Add the share of positions where the brain plays a game theoretically"
+            " optimal move to each metrics record. Training mode only"
+        ),
+    )
+    parser.add_argument(
+        "--evaluate",
+        action="store_true",
+        help=(
+            "Evaluation mode. Reports how often the training input brain's greedy"
+            " move is game theoretically optimal, per ply"
+        ),
+    )
+    parser.add_argument(
+        "--progress",
+        action="store_true",
+        help="Show a one line training progress display. Training mode only",
+    )
     parser.add_argument(
         "--exploration-rate",
         action="store",
@@ -152,6 +586,77 @@ def parse_args(available_players: list[str]) -> argparse.Namespace:
             " random move. Training mode only"
         ),
     )
+    parser.add_argument(
+        "--exploration-schedule",
+        choices=exploration_schedules,
+        default="constant",
+        help=(
+            "How the exploration rate changes over training. linear and exponential"
+            " decay from the exploration rate towards the final rate over games, count"
+            " explores rarely visited states more. Training mode only"
+        ),
+    )
+    parser.add_argument(
+        "--exploration-final",
+        action="store",
+        type=float,
+        default=0.0,
+        help=(
+            "Final exploration rate for decaying schedules, or the floor for the count"
+            " schedule. Training mode only"
+        ),
+    )
+    parser.add_argument(
+        "--exploration-decay-games",
+        action="store",
+        type=int,
+        default=10000,
+        help=(
+            "Number of games over which decaying exploration schedules decay."
+            " Training mode only"
+        ),
+    )
+    parser.add_argument(
+        "--learner",
+        choices=list(learners.keys()),
+        default="montecarlo",
+        help=(
+            "Learning algorithm. montecarlo learns from each game once it is over, td"
+            " learns during the game with TD(lambda). Training mode only"
+        ),
+    )
+    parser.add_argument(
+        "--td-lambda",
+        action="store",
+        type=float,
+        default=0.8,
+        help="Eligibility trace decay 0-1 for the td learner. Training mode only",
+    )
+    parser.add_argument(
+        "--replay-capacity",
+        action="store",
+        type=int,
+        default=10000,
+        help="Number of recent games kept for experience replay. Training mode only",
+    )
+    parser.add_argument(
+        "--replay-batch",
+        action="store",
+        type=int,
+        default=0,
+        help=(
+            "Number of stored games to learn from again after each played game. 0"
+            " disables experience replay. Training mode only"
+        ),
+    )
+    parser.add_argument(
+        "--replay-prioritized",
+        action="store_true",
+        help=(
+            "Sample replayed games by how much their last replay changed the values"
+            " instead of uniformly. Training mode only"
+        ),
+    )
     parser.add_argument(
         "--learn_rate",
         action="store",
@@ -220,17 +725,13 @@ def parse_args(available_players: list[str]) -> argparse.Namespace:
 def main() -> None:
     start_time = datetime.datetime.now()
     
-    available_players = {
-        "human": HumanPlayer,
-        "random": RandomPlayer,
-        "trained": TrainedPlayer,
-        "learn": LearnPlayer,
-    }
+    available_players = {"human": HumanPlayer, **automatic_players}
 
     args = parse_args(list(available_players.keys()))
 
     if args.seed is not None:
         random.seed(args.seed)
+    seed = SeedSequence(args.seed)
 
     if args.logfile is not None:
         handler = logging.FileHandler(args.logfile)
@@ -243,11 +744,24 @@ def main() -> None:
         if val is not None:
             logger.info("%s = %s", arg, str(val))
 
-    brain = LearnPlayerBrain(args.training_input, args.training_output)
+    brain = LearnPlayerBrain(
+        args.training_input,
+        args.training_output,
+        storage=args.storage,
+        storage_range=tuple(args.storage_range),
+        storage_path=args.storage_path,
+        count_visits=args.count_visits,
+        # For stochastic rounding in quantized storage.
+        rng=seed.child(brain_stream).generator(),
+    )
     create_player_args = {
         "brain": brain,
         "exploration_rate": args.exploration_rate,
+        "exploration_schedule": args.exploration_schedule,
+        "exploration_final": args.exploration_final,
+        "exploration_decay_games": args.exploration_decay_games,
         "learn_rate": args.learn_rate,
+        "td_lambda": args.td_lambda,
         "decay_rate": args.decay_rate,
         "o_reward_win": args.o_reward_win,
         "o_reward_loss": args.o_reward_loss,
@@ -255,17 +769,206 @@ def main() -> None:
         "x_reward_win": args.x_reward_win,
         "x_reward_loss": args.x_reward_loss,
         "x_reward_draw": args.x_reward_draw,
+        "search_budget_ms": args.search_budget_ms,
+        "search_tt_size": args.search_tt_size,
+        "mcts_iterations": args.mcts_iterations,
+        "mcts_budget_ms": args.mcts_budget_ms,
+        "mcts_rollouts": args.mcts_rollouts,
+        "mcts_use_brain": args.mcts_use_brain,
+        "mcts_reuse": args.mcts_reuse,
     }
 
-    if args.training is not None:
-        training_routine(args.training, **create_player_args)
+    if args.evaluate:
+        print(format_report(policy_optimality(brain)))
+        score = score_against_random(brain)
+        print(f"Expected score against a random player: {score:.4f}")
+    elif args.value_iteration:
+        sweeps = value_iteration(
+            brain, RewardModel(**create_player_args), tolerance=args.plan_tolerance
+        )
+        brain.save()
+        print(f"Value iteration converged in {sweeps} sweeps.")
+    elif args.tournament is not None:
+        player_args = {k: v for k, v in create_player_args.items() if k != "brain"}
+        tournament = run_tournament(
+            [PlayerSpec.parse(spec) for spec in args.tournament],
+            args.tournament_games,
+            seed=seed,
+            workers=args.tournament_workers,
+            **player_args,
+        )
+        print(format_tournament(tournament))
+    elif args.merge is not None:
+        merged = merge_brains(
+            args.merge,
+            args.training_output,
+            method=args.merge_method,
+            storage=args.storage,
+            storage_range=tuple(args.storage_range),
+            storage_path=args.storage_path,
+        )
+        print(f"Merged {len(args.merge)} brains, {len(merged.valuations)} states.")
+    elif args.serve is not None and args.training is None:
+        server = MoveServer(brain)
+        try:
+            asyncio.run(server.serve_forever(*parse_address(args.serve)))
+        except KeyboardInterrupt:
+            print(server.stats())
+    elif args.sprt is not None:
+        player_args = {k: v for k, v in create_player_args.items() if k != "brain"}
+        spec_a, spec_b = (PlayerSpec.parse(spec) for spec in args.sprt)
+        test = SPRT(
+            args.sprt_elo0,
+            args.sprt_elo1,
+            alpha=args.sprt_alpha,
+            beta=args.sprt_beta,
+        )
+        sprt_match(
+            spec_a,
+            spec_b,
+            test,
+            seed=seed,
+            max_games=args.sprt_max_games,
+            **player_args,
+        )
+        print(format_sprt(spec_a, spec_b, test))
+    elif args.worker is not None:
+        player_args = {k: v for k, v in create_player_args.items() if k != "brain"}
+        run_worker(
+            *parse_address(args.worker),
+            seed=seed,
+            batch_games=args.worker_batch,
+            learner=args.learner,
+            **player_args,
+        )
+    elif args.coordinate is not None and args.training is None:
+        print("Coordinator mode needs --training to set the number of games.")
+    elif args.coordinate is not None:
+        coordinator = Coordinator(
+            brain,
+            args.training,
+            max_lag=args.max_lag,
+            refresh_change=args.refresh_change,
+        )
+        asyncio.run(coordinator.run(*parse_address(args.coordinate)))
+        print(format_worker_stats(coordinator.stats))
+    elif args.sweep is not None and args.training is None:
+        print("Sweep mode needs --training to set the number of games per run.")
+    elif args.sweep is not None:
+        spec = sweep.load_spec(args.sweep)
+        base = {k: v for k, v in create_player_args.items() if k != "brain"}
+        base["learner"] = args.learner
+        results = sweep.run_sweep(
+            sweep.configurations(spec, base, seed.child(0)),
+            args.training,
+            seed=seed.child(1),
+            workers=args.sweep_workers,
+        )
+        print(sweep.format_results(results))
+        if args.sweep_results is not None:
+            sweep.write_results(args.sweep_results, results)
+        best = sweep.best_result(results)
+        print(f"Best configuration {best['index']} scored {best['score']:.4f}.")
+        best_brain = LearnPlayerBrain(None, args.training_output)
+        best_brain.valuations.update(best["values"])
+        best_brain.save()
+    elif args.training is not None:
+        snapshots = None
+        if args.serve is not None:
+            snapshots = SnapshotPublisher(
+                brain,
+                every_games=(
+                    None if args.snapshot_interval is not None else args.snapshot_every
+                ),
+                every_seconds=args.snapshot_interval,
+            )
+        metrics = None
+        if args.metrics_file is not None or args.progress:
+            every_games = args.metrics_every
+            if every_games is None and args.metrics_interval is None:
+                every_games = max(args.training // 100, 1)
+            metrics = TrainingMetrics(
+                brain,
+                every_games=every_games,
+                every_seconds=args.metrics_interval,
+                output_file=args.metrics_file,
+                progress=args.progress,
+                optimality=args.metrics_optimality,
+                snapshots=snapshots,
+            )
+        stopping = None
+        if (
+            args.stop_max_update is not None
+            or args.stop_mean_update is not None
+            or args.stop_policy_stable is not None
+            or args.max_time is not None
+        ):
+            stopping = StoppingCriterion(
+                window=args.stop_window,
+                max_update=args.stop_max_update,
+                mean_update=args.stop_mean_update,
+                policy_stable_windows=args.stop_policy_stable,
+                max_seconds=args.max_time,
+            )
+
+        def train() -> None:
+            games_played = training_routine(
+                args.training,
+                seed=seed,
+                rng_state_file=args.rng_state,
+                metrics=metrics,
+                stopping=stopping,
+                learner=args.learner,
+                replay_buffer=(
+                    ReplayBuffer(args.replay_capacity) if args.replay_batch else None
+                ),
+                replay_batch=args.replay_batch,
+                replay_prioritized=args.replay_prioritized,
+                sweeper=(
+                    PrioritizedSweeper(
+                        RewardModel(**create_player_args),
+                        threshold=args.planning_threshold,
+                        backups_per_game=args.planning_backups,
+                    )
+                    if args.planning_backups
+                    else None
+                ),
+                snapshots=snapshots,
+                **create_player_args,
+            )
+            if stopping is not None and stopping.reason is not None:
+                print(f"Stopped after {games_played} games: {stopping.reason}.")
+
+        if snapshots is None:
+            train()
+        else:
+            # Train in the background and serve the latest snapshot meanwhile.
+            # Serving carries on after training finishes, until interrupted.
+            server = MoveServer(brain)
+            snapshots.add_listener(server.load)
+            threading.Thread(target=train, daemon=True).start()
+            try:
+                asyncio.run(server.serve_forever(*parse_address(args.serve)))
+            except KeyboardInterrupt:
+                print(server.stats())
     else:
         if args.player_o != "human" and args.player_x != "human":
             print("Note that both players in this config are not human.")
 
-        player_o = available_players[args.player_o](BoardSymbol.O, **create_player_args)
-        player_x = available_players[args.player_x](BoardSymbol.X, **create_player_args)
-        play_again = True
+        player_o = available_players[args.player_o](
+            BoardSymbol.O,
+            rng=seed.child(BoardSymbol.O).generator(),
+            **create_player_args,
+        )
+        player_x = available_players[args.player_x](
+            BoardSymbol.X,
+            rng=seed.child(BoardSymbol.X).generator(),
+            **create_player_args,
+        )
+        if args.games is not None:
+            wins, draws, losses = play_match(player_o, player_x, args.games)
+            print(f"O wins {wins}, X wins {losses}, draws {draws}.")
+        play_again = args.games is None
         while play_again:
             play_game(player_o, player_x)
             play_again = None
@@ -0,0 +1,128 @@
+import logging
+import math
+import time
+
+from oxlearn import board as _board
+from oxlearn import rollout as _rollout
+from oxlearn.play import IPlayer as _IPlayer
+from oxlearn.training.dihedral import canonical_table as _canonical_table
+
+logger = logging.getLogger(__name__)
+
+_exploration = math.sqrt(2)
+
+
+# Monte Carlo tree search with UCT. Statistics are kept per canonical board so
+# symmetric positions, and the same position reached by different move orders,
+# share them. Each value is the average result for the player who moved into
+# the position, with a win worth 1 and a draw 0.5.
+class MCTSPlayer(_IPlayer):
+    _visits: dict[int, int]
+    _values: dict[int, float]
+
+    def __init__(
+        self,
+        symbol: _board.BoardSymbol,
+        *,
+        mcts_iterations: int | None = 2000,
+        mcts_budget_ms: float | None = None,
+        mcts_rollouts: int = 8,
+        mcts_use_brain: bool = False,
+        mcts_reuse: bool = False,
+        brain=None,
+        **kwargs,
+    ):
+        super().__init__(symbol, **kwargs)
+        _rollout.init_tables()
+        self._canonical_board = _canonical_table()
+        self._iterations = mcts_iterations
+        self._budget = None if mcts_budget_ms is None else mcts_budget_ms / 1000.0
+        self._rollouts = mcts_rollouts
+        self._brain = brain if mcts_use_brain else None
+        self._reuse = mcts_reuse
+        self._block_rng = _rollout.block_rng(self.rng)
+        self._visits = {}
+        self._values = {}
+        self.last_iterations = 0
+
+    def move(self, board: _board.Board) -> int:
+        if not self._reuse:
+            self._visits.clear()
+            self._values.clear()
+        deadline = None if self._budget is None else time.perf_counter() + self._budget
+
+        iterations = 0
+        while self._iterations is None or iterations < self._iterations:
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            self._iterate(board.encoded)
+            iterations += 1
+        self.last_iterations = iterations
+
+        best_pos = None
+        best_visits = -1
+        for pos, child in _board._movement[board.encoded].items():
+            visits = self._visits.get(self._canonical_board[child][0], 0)
+            logger.info("  %d visited %d times.", pos, visits)
+            if visits > best_visits:
+                best_visits = visits
+                best_pos = pos
+        logger.info("MCTS ran %d iterations, chose %d.", iterations, best_pos)
+        return best_pos
+
+    def notify_win(self, board: _board.Board) -> None:
+        pass
+
+    def notify_loss(self, board: _board.Board) -> None:
+        pass
+
+    def notify_draw(self, board: _board.Board) -> None:
+        pass
+
+    def _iterate(self, root: int) -> None:
+        children = _rollout.children
+        movers = _rollout.movers
+        canonical_board = self._canonical_board
+        visits = self._visits
+        values = self._values
+
+        path = [root]
+        code = root
+        while children[code]:
+            parent_visits = visits.get(canonical_board[code][0], 0)
+            child = None
+            best_score = -math.inf
+            for option in children[code]:
+                canon = canonical_board[option][0]
+                n = visits.get(canon, 0)
+                if n == 0:
+                    child = option
+                    break
+                score = values[canon] / n + _exploration * math.sqrt(
+                    math.log(parent_visits + 1) / n
+                )
+                if score > best_score:
+                    best_score = score
+                    child = option
+            path.append(child)
+            code = child
+            if visits.get(canonical_board[child][0], 0) == 0:
+                break
+
+        value = self._evaluate(code)
+        leaf_mover = movers[code]
+        for node in reversed(path):
+            canon = canonical_board[node][0]
+            visits[canon] = visits.get(canon, 0) + 1
+            mover_value = value if movers[node] == leaf_mover else 1.0 - value
+            values[canon] = values.get(canon, 0.0) + mover_value
+
+    def _evaluate(self, code: int) -> float:
+        # Result for the player who moved into the position.
+        mover = _rollout.movers[code]
+        if code in _board._game_over:
+            winner = _board._winner.get(code)
+            return 0.5 if winner is None else 1.0 if winner == mover else 0.0
+        if self._brain is not None:
+            return self._brain.value(code)
+        return _rollout.rollouts(code, self._rollouts, self._block_rng).score(mover)
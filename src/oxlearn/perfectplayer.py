@@ -0,0 +1,31 @@
+import functools
+import logging
+
+from oxlearn import board as _board
+from oxlearn.play import IPlayer as _IPlayer
+from oxlearn.solver import solve as _solve
+
+logger = logging.getLogger(__name__)
+
+
+class PerfectPlayer(_IPlayer):
+    def __init__(self, symbol: _board.BoardSymbol, **kwargs):
+        super().__init__(symbol, **kwargs)
+        self._moves = _move_table()
+
+    def move(self, board: _board.Board) -> int:
+        return self._moves[board.encoded]
+
+    def notify_win(self, board: _board.Board) -> None:
+        pass
+
+    def notify_loss(self, board: _board.Board) -> None:
+        pass
+
+    def notify_draw(self, board: _board.Board) -> None:
+        pass
+
+
+@functools.cache
+def _move_table() -> dict[int, int]:
+    return _solve().move_table()
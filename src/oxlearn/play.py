@@ -1,13 +1,19 @@
 import abc
 import logging
+import random
+import typing
 
 import oxlearn.board as _board
 
 logger = logging.getLogger(__name__)
 
 class IPlayer(abc.ABC):
-    def __init__(self, symbol: _board.BoardSymbol, **kwargs):
+    def __init__(
+        self, symbol: _board.BoardSymbol, *, rng: random.Random | None = None, **kwargs
+    ):
         self.symbol = symbol
+        # Without an injected stream fall back on the global random module.
+        self.rng = rng if rng is not None else random
 
     @abc.abstractmethod
     def move(self, board: _board.Board) -> int:
@@ -26,7 +32,13 @@ class IPlayer(abc.ABC):
         raise NotImplementedError
 
 
-def play_game(o_player: IPlayer, x_player: IPlayer) -> None:
+class GameResult(typing.NamedTuple):
+    winner: _board.BoardSymbol | None
+    board: _board.Board
+    moves: list[int]
+
+
+def play_game(o_player: IPlayer, x_player: IPlayer) -> GameResult:
     board = _board.Board(0)
     current_symbol = _board.BoardSymbol.first
 
@@ -38,6 +50,7 @@ def play_game(o_player: IPlayer, x_player: IPlayer) -> None:
     logger.info("New game: %s vs %s.", o_player.__class__.__name__, x_player.__class__.__name__)
 
     winner = None
+    moves = []
     while not board.game_over:
         logger.info("%s turn.", current_symbol)
         logger.info("Current board: %d\n%s", board.encoded, board)
@@ -49,6 +62,7 @@ def play_game(o_player: IPlayer, x_player: IPlayer) -> None:
         else:
             logger.info("%s plays %d.", current_symbol, next_pos)
             board += next_pos
+            moves.append(next_pos)
 
             if board.game_over:
                 winner = board.winner
@@ -64,3 +78,4 @@ def play_game(o_player: IPlayer, x_player: IPlayer) -> None:
         logger.info("%s wins.", winner)
         players[winner].notify_win(board)
         players[winner.next].notify_loss(board)
+    return GameResult(winner, board, moves)
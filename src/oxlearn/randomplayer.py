@@ -7,7 +7,7 @@ logger = logging.getLogger(__name__)
 
 class RandomPlayer(_IPlayer):
     def move(self, board: _board.Board) -> int:
-        return random.choice(list(board.available_positions))
+        return self.rng.choice(list(board.available_positions))
 
     def notify_win(self, board: _board.Board) -> None:
         pass
@@ -0,0 +1,125 @@
+import hashlib
+import json
+import random
+
+# Random streams are derived from a root seed by spawning child seed sequences,
+# so that each player, worker or batch gets an independent, reproducible stream
+# regardless of how the work is split up. Each stream draws its numbers in
+# blocks to amortise the cost of generating them one at a time.
+
+# Child indices of the streams that are not a player's. A player's stream is
+# the child at its BoardSymbol's value.
+replay_stream = 0
+brain_stream = 3
+
+
+class BlockRandom(random.Random):
+    default_block_size = 1024
+
+    _block: list[float]
+    _index: int
+
+    def __init__(self, seed=None, block_size: int = default_block_size):
+        self._block_size = block_size
+        self._block = []
+        self._index = 0
+        super().__init__(seed)
+
+    def seed(self, a=None, version: int = 2) -> None:
+        super().seed(a, version)
+        self._block = []
+        self._index = 0
+
+    def random(self) -> float:
+        if self._index >= len(self._block):
+            self._refill()
+        value = self._block[self._index]
+        self._index += 1
+        return value
+
+    def block(self, n: int) -> list[float]:
+        values = []
+        while len(values) < n:
+            if self._index >= len(self._block):
+                self._refill()
+            take = min(n - len(values), len(self._block) - self._index)
+            values.extend(self._block[self._index : self._index + take])
+            self._index += take
+        return values
+
+    def choice(self, seq):
+        return seq[int(self.random() * len(seq))]
+
+    def getstate(self) -> tuple:
+        return super().getstate(), self._block_size, tuple(self._block), self._index
+
+    def setstate(self, state: tuple) -> None:
+        base_state, self._block_size, block, self._index = state
+        super().setstate(base_state)
+        self._block = list(block)
+
+    def _refill(self) -> None:
+        draw = super().random
+        self._block = [draw() for _ in range(self._block_size)]
+        self._index = 0
+
+
+class SeedSequence:
+    entropy: int
+    spawn_key: tuple[int, ...]
+
+    def __init__(self, entropy: int | None = None, spawn_key: tuple[int, ...] = ()):
+        if entropy is None:
+            entropy = random.SystemRandom().getrandbits(128)
+        self.entropy = entropy
+        self.spawn_key = tuple(spawn_key)
+        self._n_children_spawned = 0
+
+    def child(self, index: int) -> "SeedSequence":
+        return SeedSequence(self.entropy, self.spawn_key + (int(index),))
+
+    def spawn(self, n_children: int) -> list["SeedSequence"]:
+        start = self._n_children_spawned
+        self._n_children_spawned += n_children
+        return [self.child(i) for i in range(start, start + n_children)]
+
+    def generate_seed(self) -> int:
+        digest = hashlib.sha256(repr((self.entropy, self.spawn_key)).encode()).digest()
+        return int.from_bytes(digest, "little")
+
+    def generator(
+        self, block_size: int = BlockRandom.default_block_size
+    ) -> BlockRandom:
+        return BlockRandom(self.generate_seed(), block_size=block_size)
+
+    def __repr__(self) -> str:
+        return f"SeedSequence({self.entropy}, {self.spawn_key})"
+
+
+def state_to_json(state: tuple) -> list:
+    if isinstance(state, tuple):
+        return [state_to_json(v) for v in state]
+    return state
+
+
+def state_from_json(state: list) -> tuple:
+    if isinstance(state, list):
+        return tuple(state_from_json(v) for v in state)
+    return state
+
+
+def save_states(file: str, rngs: dict[str, random.Random]) -> None:
+    with open(file, "w") as f:
+        json.dump({k: state_to_json(rng.getstate()) for k, rng in rngs.items()}, f)
+
+
+def load_states(file: str, rngs: dict[str, random.Random]) -> bool:
+    try:
+        with open(file, "r") as f:
+            states = json.load(f)
+    except FileNotFoundError:
+        return False
+    for k, rng in rngs.items():
+        if k in states:
+            rng.setstate(state_from_json(states[k]))
+    return True
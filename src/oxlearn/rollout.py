@@ -0,0 +1,87 @@
+import array
+import logging
+import random
+import typing
+
+from oxlearn import board as _board
+from oxlearn.rng import BlockRandom as _BlockRandom
+
+logger = logging.getLogger(__name__)
+
+
+# Random playouts run entirely on integer board codes through dense tables
+# indexed by board code, with the random numbers for a whole batch of games
+# drawn in one block.
+
+# board code : child board codes, in position order.
+children: list[tuple[int, ...]] = []
+# board code : winner as an int, 0 for none.
+winners = array.array("B")
+# board code : symbol that made the last move, or None for the empty board.
+movers: list[_board.BoardSymbol | None] = []
+
+
+class RolloutResult(typing.NamedTuple):
+    o_wins: int
+    x_wins: int
+    draws: int
+
+    @property
+    def games(self) -> int:
+        return self.o_wins + self.x_wins + self.draws
+
+    def score(self, symbol: _board.BoardSymbol) -> float:
+        wins = self.o_wins if symbol == _board.BoardSymbol.O else self.x_wins
+        return (wins + 0.5 * self.draws) / self.games if self.games else 0.0
+
+
+def init_tables() -> None:
+    if children:
+        return
+    n_codes = 3**_board.Board.size
+    children.extend([()] * n_codes)
+    winners.extend([0] * n_codes)
+    movers.extend([None] * n_codes)
+    for code, moves in _board._movement.items():
+        children[code] = tuple(moves.values())
+    for code, winner in _board._winner.items():
+        winners[code] = int(winner)
+    for code in _board.Board.all_board_codes():
+        n_pieces = sum(1 for v in _board.Board(code).representation if v != 0)
+        if n_pieces:
+            movers[code] = (
+                _board.BoardSymbol.first
+                if n_pieces % 2
+                else _board.BoardSymbol.first.next
+            )
+
+
+def block_rng(rng: random.Random) -> _BlockRandom:
+    if isinstance(rng, _BlockRandom):
+        return rng
+    return _BlockRandom(rng.getrandbits(64))
+
+
+def rollouts(code: int, n_games: int, rng: _BlockRandom) -> RolloutResult:
+    init_tables()
+    counts = [0, 0, 0]
+    _children = children
+    randoms = rng.block(n_games * _board.Board.size)
+    i = 0
+    for _ in range(n_games):
+        current = code
+        options = _children[current]
+        while options:
+            current = options[int(randoms[i] * len(options))]
+            i += 1
+            options = _children[current]
+        counts[winners[current]] += 1
+    return RolloutResult(
+        counts[_board.BoardSymbol.O], counts[_board.BoardSymbol.X], counts[0]
+    )
+
+
+def batch_rollouts(
+    codes: typing.Iterable[int], n_games: int, rng: _BlockRandom
+) -> list[RolloutResult]:
+    return [rollouts(int(code), n_games, rng) for code in codes]
@@ -0,0 +1,235 @@
+import logging
+import time
+import typing
+
+from oxlearn import board as _board
+from oxlearn.play import IPlayer as _IPlayer
+from oxlearn.training.dihedral import canonical_table as _canonical_table
+
+logger = logging.getLogger(__name__)
+
+_win_score = 1000
+_mate_bound = _win_score - 100
+# Centre, then corners, then edges.
+_move_order = (4, 0, 2, 6, 8, 1, 3, 5, 7)
+_check_every = 1024
+
+
+class _Timeout(Exception):
+    pass
+
+
+class _Entry(typing.NamedTuple):
+    key: int
+    depth: int
+    value: int
+    flag: int
+    move: int | None
+    generation: int
+
+
+class TranspositionTable:
+    EXACT = 0
+    LOWER = 1
+    UPPER = 2
+
+    # Fixed number of slots indexed by key. A new entry replaces the old one in
+    # its slot if it is for the same position, was searched at least as deep,
+    # or the old one is left over from an earlier move.
+    def __init__(self, size: int):
+        self._size = size
+        self._slots = [None] * size
+        self.generation = 0
+        self.probes = 0
+        self.hits = 0
+
+    def probe(self, key: int) -> _Entry | None:
+        self.probes += 1
+        entry = self._slots[key % self._size]
+        if entry is not None and entry.key == key:
+            self.hits += 1
+            return entry
+        return None
+
+    def store(
+        self, key: int, depth: int, value: int, flag: int, move: int | None
+    ) -> None:
+        slot = key % self._size
+        old = self._slots[slot]
+        if (
+            old is None
+            or old.key == key
+            or old.generation != self.generation
+            or depth >= old.depth
+        ):
+            self._slots[slot] = _Entry(key, depth, value, flag, move, self.generation)
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.probes if self.probes else 0.0
+
+
+class SearchPlayer(_IPlayer):
+    def __init__(
+        self,
+        symbol: _board.BoardSymbol,
+        *,
+        search_budget_ms: float = 100.0,
+        search_tt_size: int = 1 << 16,
+        **kwargs,
+    ):
+        super().__init__(symbol, **kwargs)
+        self._budget = search_budget_ms / 1000.0
+        self._tt = TranspositionTable(search_tt_size)
+        self._canonical_board = _canonical_table()
+        self._nodes = 0
+        self._elapsed = 0.0
+        self._depth_reached = 0
+
+    def move(self, board: _board.Board) -> int:
+        start = time.perf_counter()
+        self._deadline = start + self._budget
+        self._tt.generation += 1
+        self._move_nodes = 0
+
+        max_depth = len(board.available_positions)
+        best_pos = None
+        for depth in range(1, max_depth + 1):
+            try:
+                value, pos = self._search_root(board.encoded, depth, best_pos)
+            except _Timeout:
+                break
+            best_pos = pos
+            self._depth_reached = depth
+            if abs(value) > _mate_bound:
+                break
+
+        elapsed = time.perf_counter() - start
+        self._nodes += self._move_nodes
+        self._elapsed += elapsed
+        logger.info(
+            "Searched %d nodes to depth %d in %.03fs (TT hit rate %.02f).",
+            self._move_nodes,
+            self._depth_reached,
+            elapsed,
+            self._tt.hit_rate,
+        )
+        return best_pos
+
+    def notify_win(self, board: _board.Board) -> None:
+        pass
+
+    def notify_loss(self, board: _board.Board) -> None:
+        pass
+
+    def notify_draw(self, board: _board.Board) -> None:
+        pass
+
+    @property
+    def stats(self) -> dict[str, float]:
+        return {
+            "nodes": self._nodes,
+            "nodes_per_sec": self._nodes / self._elapsed if self._elapsed else 0.0,
+            "tt_probes": self._tt.probes,
+            "tt_hit_rate": self._tt.hit_rate,
+            "depth": self._depth_reached,
+        }
+
+    def _search_root(
+        self, code: int, depth: int, first_pos: int | None
+    ) -> tuple[int, int]:
+        # Depth 1 always completes so there is a move to play.
+        self._can_time_out = depth > 1
+        alpha = -_win_score - 1
+        best_pos = None
+        for pos in self._ordered_moves(code, first_pos):
+            value = -self._negamax(
+                _board._movement[code][pos], depth - 1, -_win_score - 1, -alpha, 1
+            )
+            if best_pos is None or value > alpha:
+                alpha = value
+                best_pos = pos
+        return alpha, best_pos
+
+    def _negamax(self, code: int, depth: int, alpha: int, beta: int, ply: int) -> int:
+        self._move_nodes += 1
+        if self._can_time_out and self._move_nodes % _check_every == 0:
+            if time.perf_counter() > self._deadline:
+                raise _Timeout
+
+        if code in _board._game_over:
+            # The side to move can only have lost or drawn.
+            return -(_win_score - ply) if code in _board._winner else 0
+        if depth == 0:
+            return 0
+
+        canon_code, trans = self._canonical_board[code]
+        entry = self._tt.probe(canon_code)
+        tt_pos = None
+        if entry is not None:
+            if entry.move is not None:
+                tt_pos = trans * entry.move
+            if entry.depth >= depth:
+                value = _value_from_tt(entry.value, ply)
+                if entry.flag == TranspositionTable.EXACT:
+                    return value
+                if entry.flag == TranspositionTable.LOWER and value >= beta:
+                    return value
+                if entry.flag == TranspositionTable.UPPER and value <= alpha:
+                    return value
+
+        original_alpha = alpha
+        best_value = -_win_score - 1
+        best_pos = None
+        for pos in self._ordered_moves(code, tt_pos):
+            value = -self._negamax(
+                _board._movement[code][pos], depth - 1, -beta, -alpha, ply + 1
+            )
+            if value > best_value:
+                best_value = value
+                best_pos = pos
+            if value > alpha:
+                alpha = value
+            if alpha >= beta:
+                break
+
+        if best_value <= original_alpha:
+            flag = TranspositionTable.UPPER
+        elif best_value >= beta:
+            flag = TranspositionTable.LOWER
+        else:
+            flag = TranspositionTable.EXACT
+        self._tt.store(
+            canon_code,
+            depth,
+            _value_to_tt(best_value, ply),
+            flag,
+            (~trans) * best_pos,
+        )
+        return best_value
+
+    def _ordered_moves(self, code: int, first_pos: int | None) -> list[int]:
+        options = _board._movement[code]
+        moves = [pos for pos in _move_order if pos in options]
+        if first_pos is not None:
+            moves.remove(first_pos)
+            moves.insert(0, first_pos)
+        return moves
+
+
+# Win and loss scores count plies from the root, so they are stored relative to
+# the position in the transposition table and converted back on the way out.
+def _value_to_tt(value: int, ply: int) -> int:
+    if value > _mate_bound:
+        return value + ply
+    if value < -_mate_bound:
+        return value - ply
+    return value
+
+
+def _value_from_tt(value: int, ply: int) -> int:
+    if value > _mate_bound:
+        return value - ply
+    if value < -_mate_bound:
+        return value + ply
+    return value
@@ -0,0 +1,161 @@
+import array
+import asyncio
+import logging
+import time
+
+from oxlearn import board as _board
+from oxlearn.solver import solve as _solve
+from oxlearn.training.learnplayer import LearnPlayerBrain as _LearnPlayerBrain
+
+logger = logging.getLogger(__name__)
+
+_read_size = 1 << 16
+_max_line = 1 << 16
+
+
+# Line protocol, one request per line and one reply line per request:
+#   MOVE <code> [<code> ...]  ->  OK <pos> [<pos> ...]
+#   STATS                     ->  STATS requests=<n> connections=<n> p50_us=...
+#   QUIT                      ->  closes the connection
+# Anything else, or a board code that is not a live position, gets ERR <reason>.
+# A request line longer than _max_line bytes gets an error and the connection is
+# closed, so a client cannot make the server buffer without limit.
+# Clients may send any number of requests without waiting for replies; every
+# complete request in a read is answered in a single write.
+
+
+class LatencyStats:
+    # The most recent latencies, in a fixed size ring.
+    def __init__(self, capacity: int = 100000):
+        self._samples = array.array("d", [0.0] * capacity)
+        self._capacity = capacity
+        self.count = 0
+
+    def add(self, seconds: float) -> None:
+        self._samples[self.count % self._capacity] = seconds
+        self.count += 1
+
+    def percentiles(self, *ps: float) -> list[float]:
+        samples = sorted(self._samples[: min(self.count, self._capacity)])
+        if not samples:
+            return [0.0 for _ in ps]
+        last = len(samples) - 1
+        return [samples[min(int(p / 100.0 * len(samples)), last)] for p in ps]
+
+
+class MoveServer:
+    _moves: dict[int, int]
+
+    def __init__(self, brain: _LearnPlayerBrain):
+        # Every answer is worked out up front, so a request is one dict lookup.
+        self.load(brain)
+        self.latency = LatencyStats()
+        self.requests = 0
+        self.connections = 0
+        self._server = None
+
+    def load(self, brain: _LearnPlayerBrain) -> None:
+        # Builds the new table aside and swaps it in, so requests see either
+        # the old brain's moves or the new one's. Safe to call from a thread.
+        codes = [code for code in _solve().reachable() if code not in _board._game_over]
+        self._moves = dict(zip(codes, brain.get_moves(codes)))
+        logger.info("Move server loaded %d positions.", len(self._moves))
+
+    async def start(self, host: str, port: int) -> asyncio.Server:
+        self._server = await asyncio.start_server(
+            self._handle, host, port, backlog=1024
+        )
+        return self._server
+
+    @property
+    def address(self) -> tuple[str, int]:
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def serve_forever(self, host: str, port: int) -> None:
+        server = await self.start(host, port)
+        logger.info("Serving moves on %s:%d.", *self.address)
+        async with server:
+            await server.serve_forever()
+
+    def reply(self, line: bytes) -> bytes | None:
+        words = line.split()
+        if not words:
+            return b"ERR empty request"
+        command = words[0].upper()
+        if command == b"MOVE":
+            if len(words) == 1:
+                return b"ERR no board code"
+            moves = self._moves
+            replies = [b"OK"]
+            for word in words[1:]:
+                try:
+                    pos = moves.get(int(word))
+                except ValueError:
+                    return b"ERR bad board code " + word
+                if pos is None:
+                    return b"ERR no move for " + word
+                replies.append(b"%d" % pos)
+            return b" ".join(replies)
+        if command == b"STATS":
+            return self.stats().encode()
+        if command == b"QUIT":
+            return None
+        return b"ERR unknown command " + words[0]
+
+    def stats(self) -> str:
+        p50, p90, p99, p999 = (
+            seconds * 1e6 for seconds in self.latency.percentiles(50, 90, 99, 99.9)
+        )
+        return (
+            f"STATS requests={self.requests} connections={self.connections}"
+            f" p50_us={p50:.1f} p90_us={p90:.1f} p99_us={p99:.1f} p999_us={p999:.1f}"
+        )
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self.connections += 1
+        pending = b""
+        try:
+            while True:
+                data = await reader.read(_read_size)
+                if not data:
+                    break
+                start = time.perf_counter()
+                *lines, pending = (pending + data).split(b"\n")
+                replies = []
+                done = False
+                for line in lines:
+                    reply = self.reply(line)
+                    if reply is None:
+                        done = True
+                        break
+                    replies.append(reply)
+                if not done and len(pending) > _max_line:
+                    replies.append(b"ERR request too long")
+                    done = True
+                if replies:
+                    writer.write(b"\n".join(replies) + b"\n")
+                    # A request is timed from the read it arrived in to its
+                    # reply being queued.
+                    elapsed = time.perf_counter() - start
+                    for _ in replies:
+                        self.latency.add(elapsed)
+                    self.requests += len(replies)
+                    await writer.drain()
+                if done:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            self.connections -= 1
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+
+def parse_address(address: str) -> tuple[str, int]:
+    host, _, port = address.rpartition(":")
+    return host or "127.0.0.1", int(port)
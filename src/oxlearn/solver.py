@@ -0,0 +1,125 @@
+import enum
+import functools
+import logging
+
+import oxlearn.board as _board
+
+logger = logging.getLogger(__name__)
+
+
+# Game theoretic value of a position for the side to move.
+class Outcome(enum.IntEnum):
+    LOSS = -1
+    DRAW = 0
+    WIN = 1
+
+
+class Solution:
+    _outcome: dict[int, Outcome]
+    _distance: dict[int, int]
+    _plies: list[list[int]]
+
+    def __init__(self):
+        self._plies = _reachable_by_ply()
+        self._outcome = {}
+        self._distance = {}
+        self._solve()
+
+    def outcome(self, board_code: int) -> Outcome:
+        return self._outcome[board_code]
+
+    def distance(self, board_code: int) -> int:
+        return self._distance[board_code]
+
+    @property
+    def plies(self) -> list[list[int]]:
+        return self._plies
+
+    def reachable(self) -> list[int]:
+        return [code for ply in self._plies for code in ply]
+
+    def optimal_moves(self, board_code: int) -> list[int]:
+        # Every move that keeps the game theoretic outcome, however slowly.
+        outcome = self._outcome[board_code]
+        return [
+            pos
+            for pos, child in _board._movement.get(board_code, {}).items()
+            if -self._outcome[child] == outcome
+        ]
+
+    def best_moves(self, board_code: int) -> list[int]:
+        # Optimal moves that also win fastest or lose slowest.
+        options = _board._movement.get(board_code, {})
+        if not options:
+            return []
+        ranks = {pos: self._rank(child) for pos, child in options.items()}
+        best = max(ranks.values())
+        return [pos for pos, rank in ranks.items() if rank == best]
+
+    def move_table(self) -> dict[int, int]:
+        return {
+            code: self.best_moves(code)[0]
+            for code in self.reachable()
+            if code not in _board._game_over
+        }
+
+    def _rank(self, child: int) -> tuple[int, int]:
+        return _rank(-self._outcome[child], self._distance[child] + 1)
+
+    def _solve(self) -> None:
+        # Retrograde analysis: terminal positions are labelled directly, then
+        # each ply is resolved from the one after it by walking the
+        # predecessor table, so every position is final before its parents
+        # are looked at.
+        reachable = set(self.reachable())
+        for ply in reversed(self._plies):
+            for code in ply:
+                if code in _board._game_over:
+                    winner = _board._winner.get(code)
+                    self._outcome[code] = (
+                        Outcome.DRAW if winner is None else Outcome.LOSS
+                    )
+                    self._distance[code] = 0
+            for code in ply:
+                outcome = Outcome(-self._outcome[code])
+                distance = self._distance[code] + 1
+                rank = _rank(outcome, distance)
+                for parent in _board._backwards.get(code, {}).values():
+                    if parent not in reachable:
+                        continue
+                    if parent not in self._outcome or rank > _rank(
+                        self._outcome[parent], self._distance[parent]
+                    ):
+                        self._outcome[parent] = outcome
+                        self._distance[parent] = distance
+
+
+def _rank(outcome: Outcome, distance: int) -> tuple[int, int]:
+    # Prefer better outcomes, then winning sooner and losing later.
+    if outcome == Outcome.WIN:
+        return outcome, -distance
+    if outcome == Outcome.LOSS:
+        return outcome, distance
+    return outcome, 0
+
+
+def _reachable_by_ply() -> list[list[int]]:
+    plies = [[0]]
+    while True:
+        next_ply = set()
+        for code in plies[-1]:
+            next_ply.update(_board._movement.get(code, {}).values())
+        if not next_ply:
+            return plies
+        plies.append(sorted(next_ply))
+
+
+@functools.cache
+def solve() -> Solution:
+    solution = Solution()
+    logger.info(
+        "Solved %d positions. Empty board is a %s.",
+        len(solution.reachable()),
+        solution.outcome(0).name,
+    )
+    return solution
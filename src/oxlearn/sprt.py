@@ -0,0 +1,148 @@
+import logging
+import math
+import typing
+
+from oxlearn import board as _board
+from oxlearn.play import play_game as _play_game
+from oxlearn.rng import SeedSequence as _SeedSequence
+from oxlearn.tournament import MatchResult as _MatchResult
+from oxlearn.tournament import PlayerSpec as _PlayerSpec
+
+logger = logging.getLogger(__name__)
+
+# Pseudo games of each result mixed into the variance estimate, so a run of
+# identical results does not make it zero and decide the test on one game.
+_prior = 0.5
+
+
+def expected_score(elo: float) -> float:
+    return 1.0 / (1.0 + 10.0 ** (-elo / 400.0))
+
+
+def elo_difference(score: float) -> float:
+    score = min(max(score, 1e-6), 1.0 - 1e-6)
+    return 400.0 * math.log10(score / (1.0 - score))
+
+
+# Sequential probability ratio test of H0: the Elo difference is elo0 against
+# H1: it is elo1, from the win/draw/loss results of the first player. Uses the
+# normal approximation to the log likelihood ratio of the mean score.
+class SPRT:
+    H0 = "H0"
+    H1 = "H1"
+
+    def __init__(
+        self,
+        elo0: float = 0.0,
+        elo1: float = 50.0,
+        *,
+        alpha: float = 0.05,
+        beta: float = 0.05,
+    ):
+        self.elo0 = elo0
+        self.elo1 = elo1
+        self.lower = math.log(beta / (1.0 - alpha))
+        self.upper = math.log((1.0 - beta) / alpha)
+        self._score0 = expected_score(elo0)
+        self._score1 = expected_score(elo1)
+        self.result = _MatchResult(0, 0, 0)
+
+    def add(self, result: _MatchResult) -> None:
+        self.result += result
+
+    @property
+    def llr(self) -> float:
+        games = self.result.games
+        if not games:
+            return 0.0
+        wins, draws, losses = (n + _prior for n in self.result)
+        total = wins + draws + losses
+        mean = (wins + 0.5 * draws) / total
+        variance = (
+            wins * (1.0 - mean) ** 2 + draws * (0.5 - mean) ** 2 + losses * mean**2
+        ) / total
+        s0, s1 = self._score0, self._score1
+        score = self.result.score
+        return games * (s1 - s0) * (2.0 * score - s0 - s1) / (2.0 * variance)
+
+    @property
+    def decision(self) -> str | None:
+        llr = self.llr
+        if llr >= self.upper:
+            return self.H1
+        if llr <= self.lower:
+            return self.H0
+        return None
+
+
+class SPRTResult(typing.NamedTuple):
+    decision: str | None
+    games: int
+    llr: float
+    result: _MatchResult
+
+    @property
+    def elo(self) -> float:
+        return elo_difference(self.result.score)
+
+
+def sprt_match(
+    spec_a: _PlayerSpec,
+    spec_b: _PlayerSpec,
+    test: SPRT,
+    *,
+    seed: _SeedSequence,
+    max_games: int = 10000,
+    **player_args,
+) -> SPRTResult:
+    # The players swap sides every game.
+    pairs = [
+        (
+            spec_a.create(symbol, seed.child(0).child(symbol), **player_args),
+            spec_b.create(symbol.next, seed.child(1).child(symbol.next), **player_args),
+        )
+        for symbol in (_board.BoardSymbol.O, _board.BoardSymbol.X)
+    ]
+    for game in range(max_games):
+        player_a, player_b = pairs[game % 2]
+        if player_a.symbol == _board.BoardSymbol.O:
+            winner = _play_game(player_a, player_b).winner
+        else:
+            winner = _play_game(player_b, player_a).winner
+        if winner is None:
+            test.add(_MatchResult(0, 1, 0))
+        elif winner == player_a.symbol:
+            test.add(_MatchResult(1, 0, 0))
+        else:
+            test.add(_MatchResult(0, 0, 1))
+        if test.decision is not None:
+            break
+    logger.info(
+        "SPRT %s vs %s: %s after %d games, LLR %.03f.",
+        spec_a.label,
+        spec_b.label,
+        test.decision,
+        test.result.games,
+        test.llr,
+    )
+    return SPRTResult(test.decision, test.result.games, test.llr, test.result)
+
+
+def format_sprt(spec_a: _PlayerSpec, spec_b: _PlayerSpec, test: SPRT) -> str:
+    wins, draws, losses = test.result
+    decision = test.decision
+    if decision == SPRT.H1:
+        verdict = f"{spec_a.label} is stronger (accepted elo1 = {test.elo1:g})"
+    elif decision == SPRT.H0:
+        verdict = f"{spec_a.label} is not stronger (accepted elo0 = {test.elo0:g})"
+    else:
+        verdict = "undecided"
+    return "\n".join(
+        [
+            f"{spec_a.label} vs {spec_b.label}: {wins} wins, {draws} draws,"
+            f" {losses} losses in {test.result.games} games",
+            f"Elo difference {elo_difference(test.result.score):+.0f},"
+            f" LLR {test.llr:.3f} [{test.lower:.3f}, {test.upper:.3f}]",
+            f"Result: {verdict}",
+        ]
+    )
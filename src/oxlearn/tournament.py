@@ -0,0 +1,250 @@
+import concurrent.futures
+import itertools
+import logging
+import math
+import multiprocessing
+import typing
+
+from oxlearn import board as _board
+from oxlearn.mctsplayer import MCTSPlayer as _MCTSPlayer
+from oxlearn.perfectplayer import PerfectPlayer as _PerfectPlayer
+from oxlearn.play import IPlayer as _IPlayer
+from oxlearn.play import play_game as _play_game
+from oxlearn.randomplayer import RandomPlayer as _RandomPlayer
+from oxlearn.rng import SeedSequence as _SeedSequence
+from oxlearn.searchplayer import SearchPlayer as _SearchPlayer
+from oxlearn.training import LearnPlayer as _LearnPlayer
+from oxlearn.training import LearnPlayerBrain as _LearnPlayerBrain
+from oxlearn.training import TrainedPlayer as _TrainedPlayer
+from oxlearn.training.dihedral import canonical_table as _canonical_table
+
+logger = logging.getLogger(__name__)
+
+# Players that need no one at the keyboard.
+players = {
+    "random": _RandomPlayer,
+    "trained": _TrainedPlayer,
+    "learn": _LearnPlayer,
+    "perfect": _PerfectPlayer,
+    "search": _SearchPlayer,
+    "mcts": _MCTSPlayer,
+}
+
+_chunk_games = 50
+
+
+# A player spec is a player name, optionally followed by a brain file for it to
+# load, e.g. "random" or "trained:brain.json".
+class PlayerSpec(typing.NamedTuple):
+    kind: str
+    brain_file: str | None
+    label: str
+
+    @classmethod
+    def parse(cls, spec: str) -> "PlayerSpec":
+        kind, _, brain_file = spec.partition(":")
+        if kind not in players:
+            raise ValueError(f"Unknown player '{kind}' in spec '{spec}'")
+        return cls(kind, brain_file or None, spec)
+
+    def create(
+        self, symbol: _board.BoardSymbol, seed: _SeedSequence, **player_args
+    ) -> _IPlayer:
+        brain = _LearnPlayerBrain(self.brain_file, None)
+        return players[self.kind](
+            symbol, rng=seed.generator(), **{**player_args, "brain": brain}
+        )
+
+
+# Results from the point of view of one player.
+class MatchResult(typing.NamedTuple):
+    wins: int
+    draws: int
+    losses: int
+
+    @property
+    def games(self) -> int:
+        return self.wins + self.draws + self.losses
+
+    @property
+    def score(self) -> float:
+        return (self.wins + 0.5 * self.draws) / self.games if self.games else 0.0
+
+    def __add__(self, other: "MatchResult") -> "MatchResult":
+        return MatchResult(
+            self.wins + other.wins,
+            self.draws + other.draws,
+            self.losses + other.losses,
+        )
+
+    def flipped(self) -> "MatchResult":
+        return MatchResult(self.losses, self.draws, self.wins)
+
+
+def play_match(player_o: _IPlayer, player_x: _IPlayer, n_games: int) -> MatchResult:
+    # Counted for player O.
+    wins = draws = losses = 0
+    for _ in range(n_games):
+        winner = _play_game(player_o, player_x).winner
+        if winner is None:
+            draws += 1
+        elif winner == _board.BoardSymbol.O:
+            wins += 1
+        else:
+            losses += 1
+    return MatchResult(wins, draws, losses)
+
+
+class Tournament:
+    # (i, j) : result for player i against player j, stored for i < j.
+    _results: dict[tuple[int, int], MatchResult]
+
+    def __init__(self, specs: list[PlayerSpec]):
+        self.specs = specs
+        self._results = {}
+
+    def add(self, i: int, j: int, result: MatchResult) -> None:
+        if i > j:
+            i, j, result = j, i, result.flipped()
+        self._results[(i, j)] = self._results.get((i, j), MatchResult(0, 0, 0)) + result
+
+    def result(self, i: int, j: int) -> MatchResult:
+        if i > j:
+            return self.result(j, i).flipped()
+        return self._results.get((i, j), MatchResult(0, 0, 0))
+
+    def total(self, i: int) -> MatchResult:
+        total = MatchResult(0, 0, 0)
+        for j in range(len(self.specs)):
+            if j != i:
+                total += self.result(i, j)
+        return total
+
+    def elo(self, *, iterations: int = 1000, tolerance: float = 1e-6) -> list[float]:
+        # Maximum likelihood ratings under the Elo model with draws counted as
+        # half a win, centred on zero. One extra draw per pairing keeps players
+        # that never lose, like the perfect player, at a finite rating.
+        n = len(self.specs)
+        scale = 400.0 / math.log(10.0)
+        ratings = [0.0] * n
+        for _ in range(iterations):
+            max_step = 0.0
+            for i in range(n):
+                actual = expected = information = 0.0
+                for j in range(n):
+                    result = self.result(i, j)
+                    if j == i or not result.games:
+                        continue
+                    games = result.games + 1
+                    p = 1.0 / (1.0 + 10.0 ** ((ratings[j] - ratings[i]) / 400.0))
+                    actual += result.wins + 0.5 * result.draws + 0.5
+                    expected += games * p
+                    information += games * p * (1.0 - p)
+                if information:
+                    step = scale * (actual - expected) / information
+                    ratings[i] += step
+                    max_step = max(max_step, abs(step))
+            mean = sum(ratings) / n
+            ratings = [r - mean for r in ratings]
+            if max_step < tolerance:
+                break
+        return ratings
+
+
+def run_tournament(
+    specs: list[PlayerSpec],
+    n_games: int,
+    *,
+    seed: _SeedSequence,
+    workers: int | None = None,
+    **player_args,
+) -> Tournament:
+    # Every pairing plays n_games, half with each player as O. Games are split
+    # into chunks with their own seeds so results do not depend on how the
+    # pool schedules them.
+    jobs = []
+    for pair, (i, j) in enumerate(itertools.combinations(range(len(specs)), 2)):
+        for colour, (o, x) in enumerate(((i, j), (j, i))):
+            games = n_games // 2 + (n_games % 2 if colour == 0 else 0)
+            for chunk, start in enumerate(range(0, games, _chunk_games)):
+                jobs.append(
+                    (
+                        o,
+                        x,
+                        min(_chunk_games, games - start),
+                        seed.child(pair).child(colour).child(chunk),
+                    )
+                )
+
+    # Build the shared tables before the pool forks so workers inherit them.
+    _canonical_table()
+
+    tournament = Tournament(specs)
+    context = None
+    if "fork" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("fork")
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=workers, mp_context=context
+    ) as executor:
+        futures = {
+            executor.submit(
+                _run_chunk, specs[o], specs[x], games, chunk_seed, player_args
+            ): (o, x)
+            for o, x, games, chunk_seed in jobs
+        }
+        for future in concurrent.futures.as_completed(futures):
+            o, x = futures[future]
+            tournament.add(o, x, future.result())
+    for i, j in itertools.combinations(range(len(specs)), 2):
+        logger.info(
+            "%s vs %s: %s", specs[i].label, specs[j].label, tournament.result(i, j)
+        )
+    return tournament
+
+
+def format_tournament(tournament: Tournament) -> str:
+    n = len(tournament.specs)
+    labels = [spec.label for spec in tournament.specs]
+    width = max(16, *(len(label) + 2 for label in labels))
+    lines = [
+        " " * width + "".join(f"{label:>{width}}" for label in labels),
+    ]
+    for i in range(n):
+        row = [f"{labels[i]:<{width}}"]
+        for j in range(n):
+            if i == j:
+                row.append(f"{'-':>{width}}")
+            else:
+                w, d, l = tournament.result(i, j)
+                row.append(f"{f'{w}/{d}/{l}':>{width}}")
+        lines.append("".join(row))
+
+    lines.append("")
+    lines.append(
+        f"{'player':<{width}}{'wins':>8}{'draws':>8}{'losses':>8}"
+        f"{'score':>8}{'elo':>8}"
+    )
+    ratings = tournament.elo()
+    for i in sorted(range(n), key=lambda i: -ratings[i]):
+        total = tournament.total(i)
+        lines.append(
+            f"{labels[i]:<{width}}{total.wins:>8}{total.draws:>8}{total.losses:>8}"
+            f"{total.score:>8.3f}{ratings[i]:>8.0f}"
+        )
+    return "\n".join(lines)
+
+
+def _run_chunk(
+    spec_o: PlayerSpec,
+    spec_x: PlayerSpec,
+    n_games: int,
+    seed: _SeedSequence,
+    player_args: dict,
+) -> MatchResult:
+    player_o = spec_o.create(
+        _board.BoardSymbol.O, seed.child(_board.BoardSymbol.O), **player_args
+    )
+    player_x = spec_x.create(
+        _board.BoardSymbol.X, seed.child(_board.BoardSymbol.X), **player_args
+    )
+    return play_match(player_o, player_x, n_games)
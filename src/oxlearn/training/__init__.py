@@ -1,20 +1,133 @@
-import random
+import contextlib
+import logging
 
 from oxlearn.play import play_game as _play_game
 from oxlearn.board import BoardSymbol as _BoardSymbol
+from oxlearn.rng import SeedSequence as _SeedSequence
+from oxlearn.rng import load_states as _load_states
+from oxlearn.rng import replay_stream as _replay_stream
+from oxlearn.rng import save_states as _save_states
 
 from oxlearn.training.learnplayer import TrainedPlayer
 from oxlearn.training.learnplayer import LearnPlayerBrain
 from oxlearn.training.learnplayer import LearnPlayer
+from oxlearn.training.learnplayer import ValueChangeTracker
+from oxlearn.training.metrics import TrainingMetrics
+from oxlearn.training.planning import PrioritizedSweeper
+from oxlearn.training.planning import RewardModel
+from oxlearn.training.planning import value_iteration
+from oxlearn.training.replay import ReplayBuffer
+from oxlearn.training.replay import replay as _replay
+from oxlearn.training.sharedbrain import SharedBrain
+from oxlearn.training.sharedbrain import SharedBrainPublisher
+from oxlearn.training.snapshot import BrainSnapshot
+from oxlearn.training.snapshot import SnapshotPublisher
+from oxlearn.training.stopping import StoppingCriterion
+from oxlearn.training.tdlearn import TDLearnPlayer
 
+logger = logging.getLogger(__name__)
 
+learners = {
+    "montecarlo": LearnPlayer,
+    "td": TDLearnPlayer,
+}
+
+
+def learning_players(
+    brain: LearnPlayerBrain,
+    *,
+    seed: _SeedSequence,
+    learner: str = "montecarlo",
+    **create_player_args,
+) -> tuple[LearnPlayer, LearnPlayer]:
+    player_class = learners[learner]
+    return tuple(
+        player_class(
+            symbol,
+            brain=brain,
+            rng=seed.child(symbol).generator(),
+            **create_player_args,
+        )
+        for symbol in (_BoardSymbol.O, _BoardSymbol.X)
+    )
+
+
+# Players can be passed in to carry on training with the same ones, which keeps
+# their exploration schedules going from one call to the next. Otherwise new
+# ones are made from seed.
 def training_routine(
-    n_games: int, brain: LearnPlayerBrain, **create_player_args
-) -> None:
-    player_o = LearnPlayer(_BoardSymbol.O, brain=brain, **create_player_args)
-    player_x = LearnPlayer(_BoardSymbol.X, brain=brain, **create_player_args)
+    n_games: int,
+    brain: LearnPlayerBrain,
+    *,
+    seed: _SeedSequence | None = None,
+    rng_state_file: str | None = None,
+    metrics: TrainingMetrics | None = None,
+    stopping: StoppingCriterion | None = None,
+    learner: str = "montecarlo",
+    replay_buffer: ReplayBuffer | None = None,
+    replay_batch: int = 0,
+    replay_prioritized: bool = False,
+    sweeper: PrioritizedSweeper | None = None,
+    snapshots: SnapshotPublisher | None = None,
+    players: tuple[LearnPlayer, LearnPlayer] | None = None,
+    **create_player_args,
+) -> int:
+    if seed is None:
+        seed = _SeedSequence()
+    if players is None:
+        players = learning_players(
+            brain, seed=seed, learner=learner, **create_player_args
+        )
+    player_o, player_x = players
+    rng_replay = seed.child(_replay_stream).generator()
+    rngs = {
+        str(_BoardSymbol.O): player_o.rng,
+        str(_BoardSymbol.X): player_x.rng,
+        "replay": rng_replay,
+    }
+    if rng_state_file is not None:
+        _load_states(rng_state_file, rngs)
 
-    for n in range(n_games):
-        _play_game(player_o, player_x)
+    # Everything started is closed again however training ends, so metrics
+    # files are flushed and trackers removed even on an error or Ctrl-C.
+    with contextlib.ExitStack() as started:
+        if metrics is not None:
+            metrics.start()
+            started.callback(metrics.close)
+        if stopping is not None:
+            stopping.start(brain)
+            started.callback(stopping.close)
+        if snapshots is not None:
+            snapshots.start()
+            started.callback(snapshots.close)
+        if sweeper is not None:
+            sweeper.start(brain)
+            started.callback(sweeper.close)
+        games_played = 0
+        while games_played < n_games:
+            result = _play_game(player_o, player_x)
+            games_played += 1
+            if replay_buffer is not None:
+                replay_buffer.add(result.moves, result.winner)
+                if replay_batch:
+                    _replay(
+                        {_BoardSymbol.O: player_o, _BoardSymbol.X: player_x},
+                        replay_buffer,
+                        replay_batch,
+                        rng=rng_replay,
+                        prioritized=replay_prioritized,
+                    )
+            if sweeper is not None:
+                sweeper.sweep()
+            if snapshots is not None:
+                snapshots.record(result)
+            if metrics is not None:
+                metrics.record(result)
+            if stopping is not None and stopping.should_stop():
+                break
+    logger.info("Training finished after %d games.", games_played)
 
     brain.save()
+    if rng_state_file is not None:
+        _save_states(rng_state_file, rngs)
+    return games_played
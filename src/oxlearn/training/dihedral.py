@@ -1,4 +1,5 @@
 import enum
+import functools
 
 from oxlearn.board import Board as _Board
 from oxlearn.training.permutation import Permutation as _Permutation
@@ -158,3 +159,19 @@ Dihedral.sr3._product = [
     Dihedral.e,
 ]
 Dihedral.sr3._inverse = Dihedral.sr3
+
+
+# board : (canon, trans) such that trans * canon = board
+# Built once per process and shared read-only by every user, including worker
+# processes forked after it has been built.
+@functools.cache
+def canonical_table() -> dict[int, tuple[int, Dihedral]]:
+    table = {}
+    for board_code in _Board.all_board_codes():
+        if board_code not in table:
+            board = _Board(board_code)
+            for t in Dihedral:
+                trans_board = t * board
+                if trans_board.encoded not in table:
+                    table[trans_board.encoded] = (board.encoded, t)
+    return table
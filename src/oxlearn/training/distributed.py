@@ -0,0 +1,279 @@
+import asyncio
+import json
+import logging
+import socket
+import time
+import typing
+
+from oxlearn.rng import SeedSequence as _SeedSequence
+
+from oxlearn.training.learnplayer import LearnPlayerBrain as _LearnPlayerBrain
+
+logger = logging.getLogger(__name__)
+
+# Distributed self-play over TCP, one JSON object per line.
+#
+# A worker says {"type": "hello"} and gets back an update holding the whole
+# table. It then loops: play a batch of self-play games on its own copy of the
+# table, and send {"type": "deltas", "version": v, "games": n, "seconds": s,
+# "deltas": {code: change}} with the changes it made, v being the version of
+# the last table it was sent. The coordinator adds accepted deltas into the
+# shared table, which bumps the version, and replies with one of
+#   {"type": "ack", "version": v}             keep going on the local copy
+#   {"type": "update", "version": v, "values": {code: value}, "rejected": bool}
+#                                             the entries changed since the
+#                                             worker's version
+#   {"type": "stop"}                          training is done
+# A worker's copy holds the table it was last sent plus its own changes since,
+# so it lags by the versions other workers merged since then. Deltas from a
+# copy more than max_lag versions behind are rejected, since they were learned
+# against values that have since moved too far. Otherwise a worker is sent an
+# update once the total change other workers merged since its copy passes
+# refresh_change, so updates go out often while values move quickly early on
+# and rarely once training settles, or when it reaches max_lag.
+
+
+class WorkerStats(typing.NamedTuple):
+    worker: int
+    batches: int
+    games: int
+    rejected: int
+    updates: int
+    seconds: float
+
+    @property
+    def games_per_sec(self) -> float:
+        return self.games / self.seconds if self.seconds else 0.0
+
+
+class Coordinator:
+    _modified: dict[int, int]
+    _cumulative_change: list[float]
+    _stats: dict[int, WorkerStats]
+    # worker : (versions, total change) it merged since it was last updated
+    _own: dict[int, tuple[int, float]]
+
+    def __init__(
+        self,
+        brain: _LearnPlayerBrain,
+        n_games: int,
+        *,
+        max_lag: int = 16,
+        refresh_change: float = 1.0,
+    ):
+        self._brain = brain
+        self._n_games = n_games
+        self._max_lag = max_lag
+        self._refresh_change = refresh_change
+        self.version = 0
+        # canonical code : version it last changed in
+        self._modified = {code: 0 for code in brain.valuations}
+        # Total absolute change merged up to each version.
+        self._cumulative_change = [0.0]
+        self._stats = {}
+        self._own = {}
+        self._connections = 0
+        self._next_worker = 0
+        self.games = 0
+        self._done = asyncio.Event()
+        self._server = None
+
+    async def start(self, host: str, port: int) -> asyncio.Server:
+        self._server = await asyncio.start_server(self._handle, host, port)
+        return self._server
+
+    @property
+    def address(self) -> tuple[str, int]:
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def wait(self) -> None:
+        # Returns once n_games have been merged and every worker has been told
+        # to stop.
+        async with self._server:
+            await self._done.wait()
+        self._brain.save()
+
+    async def run(self, host: str, port: int) -> None:
+        await self.start(host, port)
+        logger.info("Coordinating on %s:%d.", *self.address)
+        await self.wait()
+
+    @property
+    def stats(self) -> list[WorkerStats]:
+        return [self._stats[worker] for worker in sorted(self._stats)]
+
+    def merge(self, worker: int, message: dict) -> dict:
+        version = message["version"]
+        stats = self._stats[worker]
+        games = stats.games + message["games"]
+        seconds = stats.seconds + message["seconds"]
+        if self.games >= self._n_games:
+            return {"type": "stop"}
+        own_merges, own_change = self._own[worker]
+        lag = self.version - version - own_merges
+        if lag > self._max_lag:
+            self._stats[worker] = stats._replace(
+                batches=stats.batches + 1,
+                rejected=stats.rejected + 1,
+                updates=stats.updates + 1,
+                seconds=seconds,
+            )
+            return self._update(worker, version, rejected=True)
+
+        # Deltas from an older copy are scaled down by the number of merges
+        # it missed. Those mostly moved the values the same way already, and
+        # several workers adding the same lesson in full would overshoot.
+        weight = 1.0 / (1 + lag)
+        self.version += 1
+        change = 0.0
+        for code, delta in message["deltas"].items():
+            code = int(code)
+            delta *= weight
+            self._brain.set_value(code, self._brain.value(code) + delta)
+            self._modified[code] = self.version
+            change += abs(delta)
+        self._cumulative_change.append(self._cumulative_change[-1] + change)
+        self._own[worker] = (own_merges + 1, own_change + change)
+        self.games += message["games"]
+        stats = stats._replace(batches=stats.batches + 1, games=games, seconds=seconds)
+        self._stats[worker] = stats
+        logger.info(
+            "Merged %d deltas from worker %d at version %d, %d games in total.",
+            len(message["deltas"]),
+            worker,
+            self.version,
+            self.games,
+        )
+
+        if self.games >= self._n_games:
+            return {"type": "stop"}
+        others_change = (
+            self._cumulative_change[-1]
+            - self._cumulative_change[version]
+            - own_change
+            - change
+        )
+        if lag >= self._max_lag or others_change >= self._refresh_change:
+            self._stats[worker] = stats._replace(updates=stats.updates + 1)
+            return self._update(worker, version)
+        return {"type": "ack", "version": self.version}
+
+    def _update(self, worker: int, since: int, *, rejected: bool = False) -> dict:
+        self._own[worker] = (0, 0.0)
+        return {
+            "type": "update",
+            "version": self.version,
+            "values": {
+                code: self._brain.value(code)
+                for code, version in self._modified.items()
+                if version > since
+            },
+            "rejected": rejected,
+        }
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        worker = self._next_worker
+        self._next_worker += 1
+        self._connections += 1
+        self._stats[worker] = WorkerStats(worker, 0, 0, 0, 0, 0.0)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                message = json.loads(line)
+                if message["type"] == "hello":
+                    reply = {**self._update(worker, -1), "worker": worker}
+                else:
+                    reply = self.merge(worker, message)
+                writer.write(json.dumps(reply).encode() + b"\n")
+                await writer.drain()
+                if reply["type"] == "stop":
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            self._connections -= 1
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+            if self.games >= self._n_games and not self._connections:
+                self._done.set()
+
+
+def format_stats(stats: list[WorkerStats]) -> str:
+    columns = ["worker", "batches", "games", "rejected", "updates", "games/s"]
+    lines = [" ".join(f"{c:>10}" for c in columns)]
+    for s in stats:
+        lines.append(
+            f"{s.worker:>10} {s.batches:>10} {s.games:>10} {s.rejected:>10}"
+            f" {s.updates:>10} {s.games_per_sec:>10.0f}"
+        )
+    return "\n".join(lines)
+
+
+def run_worker(
+    host: str,
+    port: int,
+    *,
+    seed: _SeedSequence,
+    batch_games: int = 500,
+    learner: str = "montecarlo",
+    **create_player_args,
+) -> int:
+    # Imported here to avoid a circular import with the package __init__.
+    from oxlearn.training import learning_players
+    from oxlearn.training import training_routine
+
+    brain = _LearnPlayerBrain(None, None)
+    batches = 0
+    with socket.create_connection((host, port)) as sock:
+        stream = sock.makefile("rwb")
+
+        def send(message: dict) -> dict:
+            stream.write(json.dumps(message).encode() + b"\n")
+            stream.flush()
+            return json.loads(stream.readline())
+
+        reply = send({"type": "hello"})
+        worker = reply["worker"]
+        seed = seed.child(worker)
+        # The same players play every batch, so exploration schedules run on
+        # over the whole of the worker's training.
+        players = learning_players(
+            brain, seed=seed, learner=learner, **create_player_args
+        )
+        while reply["type"] != "stop":
+            if reply.get("rejected"):
+                # Drop the batch's learning along with the deltas.
+                for code, value in base.items():
+                    brain.set_value(code, value)
+            if reply["type"] == "update":
+                version = reply["version"]
+                for code, value in reply["values"].items():
+                    brain.set_value(int(code), value)
+            base = {code: brain.value(code) for code in brain.canonical_codes()}
+            start = time.perf_counter()
+            training_routine(batch_games, brain, seed=seed, players=players)
+            seconds = time.perf_counter() - start
+            batches += 1
+            deltas = {
+                code: brain.value(code) - value
+                for code, value in base.items()
+                if brain.value(code) != value
+            }
+            reply = send(
+                {
+                    "type": "deltas",
+                    "version": version,
+                    "games": batch_games,
+                    "seconds": seconds,
+                    "deltas": deltas,
+                }
+            )
+    logger.info("Worker %d finished after %d batches.", worker, batches)
+    return batches
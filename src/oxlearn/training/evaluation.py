@@ -0,0 +1,183 @@
+import logging
+import typing
+import weakref
+
+from oxlearn import board as _board
+from oxlearn.board import BoardSymbol as _BoardSymbol
+from oxlearn.solver import Outcome as _Outcome
+from oxlearn.solver import solve as _solve
+
+from oxlearn.training.learnplayer import LearnPlayerBrain as _LearnPlayerBrain
+
+logger = logging.getLogger(__name__)
+
+
+class PlyReport(typing.NamedTuple):
+    states: int
+    optimal: int
+    blunders: int
+
+
+class PolicyReport(typing.NamedTuple):
+    states: int
+    optimal: int
+    blunders: int
+    # ply : report for the positions with that many pieces on the board.
+    plies: dict[int, PlyReport]
+
+    @property
+    def optimal_rate(self) -> float:
+        return self.optimal / self.states if self.states else 0.0
+
+
+# Compares the brain's greedy move in every reachable position that is not over
+# against the game theoretic moves. A move is optimal if it keeps the position's
+# outcome, and a blunder if it turns a won or drawn position into a lost one.
+def policy_optimality(brain: _LearnPlayerBrain) -> PolicyReport:
+    solution = _solve()
+    plies = {}
+    for ply, codes in enumerate(solution.plies):
+        n_states = n_optimal = n_blunders = 0
+        for code in codes:
+            moves = _board._movement.get(code)
+            if not moves:
+                continue
+            outcome = solution.outcome(code)
+            result = -solution.outcome(moves[brain.greedy_move(code)])
+            n_states += 1
+            if result == outcome:
+                n_optimal += 1
+            elif result == _Outcome.LOSS:
+                n_blunders += 1
+        if n_states:
+            plies[ply] = PlyReport(n_states, n_optimal, n_blunders)
+    report = PolicyReport(
+        sum(p.states for p in plies.values()),
+        sum(p.optimal for p in plies.values()),
+        sum(p.blunders for p in plies.values()),
+        plies,
+    )
+    logger.info(
+        "Policy optimal in %d of %d positions with %d blunders.",
+        report.optimal,
+        report.states,
+        report.blunders,
+    )
+    return report
+
+
+def format_report(report: PolicyReport) -> str:
+    lines = [f"{'ply':>4} {'states':>8} {'optimal':>8} {'blunders':>8}"]
+    for ply, p in report.plies.items():
+        lines.append(f"{ply:>4} {p.states:>8} {p.optimal:>8} {p.blunders:>8}")
+    lines.append(
+        f"{'all':>4} {report.states:>8} {report.optimal:>8} {report.blunders:>8}"
+        f"  ({report.optimal_rate:.2%} optimal)"
+    )
+    return "\n".join(lines)
+
+
+class ExpectedOutcome(typing.NamedTuple):
+    o_win: float
+    x_win: float
+    draw: float
+
+    def score(self, symbol: _BoardSymbol) -> float:
+        win = self.o_win if symbol == _BoardSymbol.O else self.x_win
+        return win + 0.5 * self.draw
+
+
+# A stochastic policy as a table of board code : ((pos, probability), ...) for
+# every reachable position that is not over. Policies are not changed once
+# made, so results for them can be cached by identity.
+class Policy:
+    _moves: dict[int, tuple[tuple[int, float], ...]]
+
+    def __init__(self, moves: dict[int, tuple[tuple[int, float], ...]]):
+        self._moves = moves
+        self.deterministic = all(len(options) == 1 for options in moves.values())
+
+    def __getitem__(self, board_code: int) -> tuple[tuple[int, float], ...]:
+        return self._moves[board_code]
+
+
+def _positions() -> list[int]:
+    return [code for code in _solve().reachable() if code not in _board._game_over]
+
+
+def random_policy() -> Policy:
+    moves = {}
+    for code in _positions():
+        options = list(_board._movement[code])
+        moves[code] = tuple((pos, 1.0 / len(options)) for pos in options)
+    return Policy(moves)
+
+
+def perfect_policy() -> Policy:
+    table = _solve().move_table()
+    return Policy({code: ((pos, 1.0),) for code, pos in table.items()})
+
+
+def brain_policy(brain: _LearnPlayerBrain, exploration_rate: float = 0.0) -> Policy:
+    # What a TrainedPlayer plays, or a LearnPlayer with a constant exploration
+    # rate: the greedy move, or a uniformly random one with that probability.
+    moves = {}
+    for code in _positions():
+        greedy = brain.greedy_move(code)
+        options = list(_board._movement[code])
+        if exploration_rate == 0.0:
+            moves[code] = ((greedy, 1.0),)
+            continue
+        explore = exploration_rate / len(options)
+        moves[code] = tuple(
+            (pos, explore + (1.0 - exploration_rate if pos == greedy else 0.0))
+            for pos in options
+        )
+    return Policy(moves)
+
+
+# policy_o : policy_x : result, for deterministic pairs. Entries go along with
+# either of their policies.
+_outcome_cache: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def expected_outcome(policy_o: Policy, policy_x: Policy) -> ExpectedOutcome:
+    if not (policy_o.deterministic and policy_x.deterministic):
+        return _search(policy_o, policy_x)
+    outcomes = _outcome_cache.setdefault(policy_o, weakref.WeakKeyDictionary())
+    result = outcomes.get(policy_x)
+    if result is None:
+        result = outcomes[policy_x] = _search(policy_o, policy_x)
+    return result
+
+
+def _search(policy_o: Policy, policy_x: Policy) -> ExpectedOutcome:
+    # Pushes the probability of each position forward from the empty board one
+    # ply at a time, collecting it wherever the game ends.
+    totals = {_BoardSymbol.O: 0.0, _BoardSymbol.X: 0.0, None: 0.0}
+    current = {0: 1.0}
+    policy = policy_o
+    while current:
+        following = {}
+        for code, p in current.items():
+            if code in _board._game_over:
+                totals[_board._winner.get(code)] += p
+                continue
+            children = _board._movement[code]
+            for pos, q in policy[code]:
+                child = children[pos]
+                following[child] = following.get(child, 0.0) + p * q
+        current = following
+        policy = policy_x if policy is policy_o else policy_o
+
+    return ExpectedOutcome(totals[_BoardSymbol.O], totals[_BoardSymbol.X], totals[None])
+
+
+def score_against_random(brain: _LearnPlayerBrain) -> float:
+    # Expected points per game for the greedy brain against a random player,
+    # averaged over playing either side.
+    policy = brain_policy(brain)
+    opponent = random_policy()
+    as_o = expected_outcome(policy, opponent).score(_BoardSymbol.O)
+    as_x = expected_outcome(opponent, policy).score(_BoardSymbol.X)
+    return (as_o + as_x) / 2
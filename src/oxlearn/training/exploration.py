@@ -0,0 +1,81 @@
+import abc
+import math
+
+from oxlearn.training.dihedral import canonical_table as _canonical_table
+
+
+class ExplorationSchedule(abc.ABC):
+    @abc.abstractmethod
+    def rate(self, games_played: int, board_code: int) -> float:
+        raise NotImplementedError
+
+    def visit(self, board_code: int) -> None:
+        pass
+
+
+class ConstantExploration(ExplorationSchedule):
+    def __init__(self, rate: float):
+        self._rate = rate
+
+    def rate(self, games_played: int, board_code: int) -> float:
+        return self._rate
+
+
+class LinearExploration(ExplorationSchedule):
+    def __init__(self, start: float, final: float, decay_games: int):
+        self._start = start
+        self._final = final
+        self._decay_games = max(decay_games, 1)
+
+    def rate(self, games_played: int, board_code: int) -> float:
+        progress = min(games_played / self._decay_games, 1.0)
+        return self._start + (self._final - self._start) * progress
+
+
+class ExponentialExploration(ExplorationSchedule):
+    # Decays towards final by a factor of e every decay_games games.
+    def __init__(self, start: float, final: float, decay_games: int):
+        self._start = start
+        self._final = final
+        self._decay_games = max(decay_games, 1)
+
+    def rate(self, games_played: int, board_code: int) -> float:
+        decay = math.exp(-games_played / self._decay_games)
+        return self._final + (self._start - self._final) * decay
+
+
+class CountExploration(ExplorationSchedule):
+    # Explores rarely seen canonical states more: the rate falls off with the
+    # inverse square root of the number of visits, down to a floor of final.
+    _visits: dict[int, int]
+
+    def __init__(self, start: float, final: float):
+        self._start = start
+        self._final = final
+        self._canonical_board = _canonical_table()
+        self._visits = {}
+
+    def rate(self, games_played: int, board_code: int) -> float:
+        visits = self._visits.get(self._canonical_board[board_code][0], 0)
+        return max(self._final, self._start / math.sqrt(1 + visits))
+
+    def visit(self, board_code: int) -> None:
+        canon_code = self._canonical_board[board_code][0]
+        self._visits[canon_code] = self._visits.get(canon_code, 0) + 1
+
+
+schedules = ["constant", "linear", "exponential", "count"]
+
+
+def make_schedule(
+    name: str, start: float, final: float, decay_games: int
+) -> ExplorationSchedule:
+    if name == "constant":
+        return ConstantExploration(start)
+    if name == "linear":
+        return LinearExploration(start, final, decay_games)
+    if name == "exponential":
+        return ExponentialExploration(start, final, decay_games)
+    if name == "count":
+        return CountExploration(start, final)
+    raise ValueError(f"Unknown exploration schedule '{name}'")
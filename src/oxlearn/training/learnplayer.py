@@ -1,38 +1,105 @@
+import functools
 import json
 import logging
 import random
+import typing
 
+from oxlearn import board as _board
 from oxlearn.board import Board as _Board
 from oxlearn.board import BoardSymbol as _BoardSymbol
 from oxlearn.play import IPlayer as _IPlayer
 
 from oxlearn.training.dihedral import Dihedral as _Dihedral
+from oxlearn.training.dihedral import canonical_table as _canonical_table
+from oxlearn.training.exploration import make_schedule as _make_schedule
+from oxlearn.training.storage import SQLiteStore as _SQLiteStore
+from oxlearn.training.storage import make_store as _make_store
+from oxlearn.training.storage import store_spec as _store_spec
 
 logger = logging.getLogger(__name__)
 
+
+class ValueChangeTracker:
+    updated: set[int]
+    n_updates: int
+    total_change: float
+    max_change: float
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self.updated = set()
+        self.n_updates = 0
+        self.total_change = 0.0
+        self.max_change = 0.0
+
+    def add(self, canon_code: int, change: float) -> None:
+        self.updated.add(canon_code)
+        self.n_updates += 1
+        self.total_change += change
+        if change > self.max_change:
+            self.max_change = change
+
+    @property
+    def mean_change(self) -> float:
+        return self.total_change / self.n_updates if self.n_updates else 0.0
+
+
 class LearnPlayerBrain:
     # board : (canon, trans) such that trans * canon = board
     _canonical_board: dict[int, tuple[int, _Dihedral]]
-    _board_valuation: dict[int, int]
+    _board_valuation: typing.MutableMapping[int, float]
+    _trackers: list[ValueChangeTracker]
+    # canonical code : number of updates, if counted
+    _visits: dict[int, int] | None
 
-    def __init__(self, input_file: str, output_file: str):
-        self._canonical_board = {}
-        self._board_valuation = {}
+    # storage picks how values are held, see storage.storages. By default a
+    # brain keeps whatever its input file was saved with. With count_visits
+    # the brain counts updates to each state and saves the counts, and a brain
+    # loaded from a file with counts carries on counting.
+    def __init__(
+        self,
+        input_file: str | None,
+        output_file: str | None,
+        *,
+        storage: str | None = None,
+        storage_range: tuple[float, float] = (-1.0, 1.0),
+        storage_path: str | None = None,
+        count_visits: bool = False,
+        rng: random.Random | None = None,
+    ):
+        self._canonical_board = _canonical_table()
+        self._trackers = []
         self._output_file = output_file
-        for board_code in _Board.all_board_codes():
-            if board_code not in self._canonical_board:
-                board = _Board(board_code)
-                for t in _Dihedral:
-                    trans_board = t * board
-                    if trans_board.encoded not in self._canonical_board:
-                        self._canonical_board[trans_board.encoded] = (board.encoded, t)
-        try:
-            with open(input_file, "r") as f:
-                self._board_valuation = {}
-                for k, v in json.load(f).items():
-                    self._board_valuation[int(k)] = v
-        except FileNotFoundError:
-            pass
+        self._visits = {} if count_visits else None
+        values = {}
+        spec = {}
+        if input_file is not None:
+            try:
+                values, visits, spec = read_brain_file(input_file)
+                if visits is not None:
+                    self._visits = visits
+            except FileNotFoundError:
+                pass
+        if storage is None:
+            storage = spec.get("quantization", "dict")
+            storage_range = tuple(spec.get("range", storage_range))
+        self._board_valuation = _make_store(
+            storage, value_range=storage_range, rng=rng, path=storage_path
+        )
+        if values and isinstance(self._board_valuation, _SQLiteStore):
+            if len(self._board_valuation):
+                # The database is where an on disk brain lives, so it wins over
+                # whatever the input file holds.
+                logger.info(
+                    "Keeping the %d values in %s rather than loading %s.",
+                    len(self._board_valuation),
+                    storage_path,
+                    input_file,
+                )
+                values = {}
+        self._board_valuation.update(values)
         logger.debug("Brain canonicals: %s", self._canonical_board)
         logger.debug("Board valuations: %s", self._board_valuation)
 
@@ -68,19 +135,130 @@ class LearnPlayerBrain:
             valuation += learn_rate * (decay_rate * reward - valuation)
             logger.info("= %.05f", valuation)
             reward = valuation
-            self._board_valuation[canon_code] = valuation
+            self.set_value(canon_code, valuation)
+
+    def learn_td(
+        self,
+        traces: dict[int, float],
+        board_code: int,
+        target: float,
+        learn_rate: float,
+        trace_decay: float,
+    ) -> None:
+        canon_code, trans = self._canonical(board_code)
+        for code in traces:
+            traces[code] *= trace_decay
+        traces[canon_code] = traces.get(canon_code, 0.0) + 1.0
+        delta = target - self._board_value(canon_code)
+        logger.info("TD update. Board %d delta %.05f", canon_code, delta)
+        for code, trace in traces.items():
+            self.set_value(code, self._board_value(code) + learn_rate * delta * trace)
+
+    def value(self, board_code: int) -> float:
+        return self._board_value(self._canonical(board_code)[0])
+
+    def greedy_move(self, board_code: int) -> int:
+        # get_move without the logging.
+        canon_code, trans = self._canonical(board_code)
+        return trans * self._greedy_move(canon_code)
+
+    def get_moves(self, board_codes: typing.Iterable[int]) -> list[int | None]:
+        # greedy_move for many boards at once, None for finished games.
+        moves = []
+        for board_code in board_codes:
+            canon_code, trans = self._canonical(board_code)
+            pos = self._greedy_move(canon_code)
+            moves.append(None if pos is None else trans * pos)
+        return moves
+
+    def move_values(
+        self, board_codes: typing.Iterable[int]
+    ) -> list[list[float | None]]:
+        # One row of values per board, indexed by position, None where the
+        # position is taken or the game is over.
+        valuation = self._board_valuation
+        return [
+            [
+                None if afterstate is None else valuation.get(afterstate, 0)
+                for afterstate in _afterstates(board_code)
+            ]
+            for board_code in board_codes
+        ]
+
+    def greedy_policy(self) -> dict[int, int]:
+        return {
+            canon_code: self._greedy_move(canon_code)
+            for canon_code in self.canonical_codes()
+            if not _Board(canon_code).game_over
+        }
+
+    def canonical_codes(self) -> list[int]:
+        return sorted({canon_code for canon_code, _ in self._canonical_board.values()})
+
+    def set_value(self, canon_code: int, value: float) -> None:
+        if self._trackers:
+            change = abs(value - self._board_value(canon_code))
+            for tracker in self._trackers:
+                tracker.add(canon_code, change)
+        self._board_valuation[canon_code] = value
+        if self._visits is not None:
+            self._visits[canon_code] = self._visits.get(canon_code, 0) + 1
+
+    def add_tracker(self, tracker: ValueChangeTracker) -> None:
+        self._trackers.append(tracker)
+
+    def remove_tracker(self, tracker: ValueChangeTracker) -> None:
+        self._trackers.remove(tracker)
+
+    @property
+    def valuations(self) -> typing.MutableMapping[int, float]:
+        return self._board_valuation
+
+    @property
+    def visits(self) -> dict[int, int] | None:
+        return self._visits
 
     def save(self) -> None:
+        if isinstance(self._board_valuation, _SQLiteStore):
+            self._board_valuation.flush()
+            logger.info("Value cache hit rate %.03f.", self._board_valuation.hit_rate)
+        if self._output_file is None:
+            return
+        # Written out one entry at a time, so storage kept on disk is never
+        # all in memory at once.
+        values = ((k, v) for k, v in self._board_valuation.items() if v > 1e-5)
+        spec = _store_spec(self._board_valuation)
+        if spec["quantization"] == "dict":
+            spec = {}
         with open(self._output_file, "w") as f:
-            json.dump(
-                {k: v for k, v in self._board_valuation.items() if v > 1e-5},
-                f,
-                indent=4,
-            )
+            if not spec and self._visits is None:
+                _dump_items(f, values, "")
+                return
+            f.write("{")
+            for key, value in spec.items():
+                f.write(f"\n    {json.dumps(key)}: {json.dumps(value)},")
+            f.write('\n    "values": ')
+            _dump_items(f, values, "    ")
+            if self._visits is not None:
+                f.write(',\n    "visits": ')
+                _dump_items(f, self._visits.items(), "    ")
+            f.write("\n}")
 
     def _board_value(self, canon_code: int) -> int:
         return self._board_valuation.get(canon_code, 0)
 
+    def _greedy_move(self, canon_code: int) -> int:
+        # Same tie breaking as get_move: the last of the best options wins.
+        valuation = self._board_valuation
+        value_max = -0xFFFF
+        next_pos = None
+        for pos, afterstate in _options(canon_code):
+            value = valuation.get(afterstate, 0)
+            if value >= value_max:
+                value_max = value
+                next_pos = pos
+        return next_pos
+
     def _canonical(self, board_code: int) -> tuple[int, _Dihedral]:
         return self._canonical_board[board_code]
 
@@ -88,6 +266,56 @@ class LearnPlayerBrain:
         return self._canonical((_Board(canon_code) + pos).encoded)[0]
 
 
+def _dump_items(
+    f: typing.TextIO, items: typing.Iterable[tuple[int, float]], indent: str
+) -> None:
+    # A JSON object laid out like json.dump with indent=4, nested by indent.
+    f.write("{")
+    separator = "\n"
+    for key, value in items:
+        f.write(f'{separator}{indent}    "{key}": {json.dumps(value)}')
+        separator = ",\n"
+    f.write("}" if separator == "\n" else f"\n{indent}}}")
+
+
+def read_brain_file(
+    file: str,
+) -> tuple[dict[int, float], dict[int, int] | None, dict]:
+    # Values, visit counts if saved, and storage spec. Brains saved with
+    # quantized storage or visit counts keep the values under "values"; plain
+    # ones are just the values.
+    with open(file, "r") as f:
+        data = json.load(f)
+    spec = {}
+    visits = None
+    if "values" in data:
+        spec = {k: v for k, v in data.items() if k not in ("values", "visits")}
+        if "visits" in data:
+            visits = {int(k): v for k, v in data["visits"].items()}
+        data = data["values"]
+    return {int(k): v for k, v in data.items()}, visits, spec
+
+
+@functools.cache
+def _options(canon_code: int) -> tuple[tuple[int, int], ...]:
+    # (pos, canonical afterstate) for each move, in the order get_move sees them.
+    table = _canonical_table()
+    return tuple(
+        (pos, table[board_code][0])
+        for pos, board_code in _board._movement.get(canon_code, {}).items()
+    )
+
+
+@functools.cache
+def _afterstates(board_code: int) -> tuple[int | None, ...]:
+    # Canonical afterstate of each position, None where no move is possible.
+    table = _canonical_table()
+    moves = _board._movement.get(board_code, {})
+    return tuple(
+        table[moves[pos]][0] if pos in moves else None for pos in _Board.all_positions()
+    )
+
+
 class TrainedPlayer(_IPlayer):
     def __init__(self, symbol: _BoardSymbol, brain: LearnPlayerBrain, **kwargs):
         super().__init__(symbol, **kwargs)
@@ -119,6 +347,9 @@ class LearnPlayer(TrainedPlayer):
         exploration_rate: float,
         learn_rate: float,
         decay_rate: float,
+        exploration_schedule: str = "constant",
+        exploration_final: float = 0.0,
+        exploration_decay_games: int = 10000,
         **kwargs,
     ):
         super().__init__(symbol, brain, **kwargs)
@@ -135,14 +366,25 @@ class LearnPlayer(TrainedPlayer):
             "o_reward_draw" if symbol == _BoardSymbol.O else "x_reward_draw"
         ]
 
-        self._exploration_rate = exploration_rate
+        self._exploration = _make_schedule(
+            exploration_schedule,
+            exploration_rate,
+            exploration_final,
+            exploration_decay_games,
+        )
+        self._games_played = 0
         self._learn_rate = learn_rate
         self._decay_rate = decay_rate
 
+    def exploration_rate(self, board_code: int) -> float:
+        return self._exploration.rate(self._games_played, board_code)
+
     def move(self, board: _Board) -> int:
-        if random.random() < self._exploration_rate:
+        exploration_rate = self.exploration_rate(board.encoded)
+        self._exploration.visit(board.encoded)
+        if self.rng.random() < exploration_rate:
             logger.info("Making random choice.")
-            pos = random.choice(list(board.available_positions))
+            pos = self.rng.choice(list(board.available_positions))
         else:
             logger.info("Making trained choice.")
             pos = super().move(board)
@@ -151,21 +393,29 @@ class LearnPlayer(TrainedPlayer):
 
     def notify_win(self, board: _Board) -> None:
         logger.info("Learning from win.")
-        self.brain.learn(
-            self._history, self._reward_win, self._learn_rate, self._decay_rate
-        )
-        self._history = []
+        self._learn(self._reward_win)
 
     def notify_loss(self, board: _Board) -> None:
         logger.info("Learning from loss.")
-        self.brain.learn(
-            self._history, self._reward_loss, self._learn_rate, self._decay_rate
-        )
-        self._history = []
+        self._learn(self._reward_loss)
 
     def notify_draw(self, board: _Board) -> None:
         logger.info("Learning from draw.")
-        self.brain.learn(
-            self._history, self._reward_draw, self._learn_rate, self._decay_rate
-        )
+        self._learn(self._reward_draw)
+
+    def replay(self, history: list[int], winner: _BoardSymbol | None) -> None:
+        # Learns again from this player's afterstates in a past game, the same
+        # way as at the end of playing it.
+        if winner is None:
+            reward = self._reward_draw
+        else:
+            reward = self._reward_win if winner == self.symbol else self._reward_loss
+        self._learn_history(history, reward)
+
+    def _learn(self, reward: float) -> None:
+        self._learn_history(self._history, reward)
         self._history = []
+        self._games_played += 1
+
+    def _learn_history(self, history: list[int], reward: float) -> None:
+        self.brain.learn(history, reward, self._learn_rate, self._decay_rate)
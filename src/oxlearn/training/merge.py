@@ -0,0 +1,77 @@
+import logging
+import typing
+
+from oxlearn.training.learnplayer import LearnPlayerBrain as _LearnPlayerBrain
+from oxlearn.training.learnplayer import read_brain_file as _read_brain_file
+
+logger = logging.getLogger(__name__)
+
+methods = ["visits", "best"]
+
+
+# Combines brains trained independently into one. Files are read one at a time
+# and folded into a running total per state, so only one file's values are in
+# memory besides the result. With "visits" each state gets the average of its
+# values weighted by how often each brain updated it, and with "best" the value
+# from the brain that updated it most. Brains saved without visit counts count
+# as one visit for every state they have a value for. A state a brain counted
+# visits for but saved no value for had a value of about zero.
+def merge_brains(
+    input_files: typing.Iterable[str],
+    output_file: str,
+    *,
+    method: str = "visits",
+    storage: str | None = None,
+    storage_range: tuple[float, float] = (-1.0, 1.0),
+    storage_path: str | None = None,
+) -> _LearnPlayerBrain:
+    if method not in methods:
+        raise ValueError(f"Unknown merge method '{method}'")
+    # canonical code : [total visits, visit weighted sum of values] for
+    # "visits", or [most visits, value from that brain] for "best"
+    merged: dict[int, list[float]] = {}
+    files = 0
+    for input_file in input_files:
+        values, visits, spec = _read_brain_file(input_file)
+        if visits is None:
+            logger.warning("%s has no visit counts, weighting it 1.", input_file)
+            visits = {}
+        if storage is None:
+            storage = spec.get("quantization", "dict")
+            storage_range = tuple(spec.get("range", storage_range))
+        for code in values.keys() | visits.keys():
+            weight = visits.get(code, 1)
+            value = values.get(code, 0.0)
+            entry = merged.get(code)
+            if entry is None:
+                merged[code] = [weight, weight * value if method == "visits" else value]
+            elif method == "visits":
+                entry[0] += weight
+                entry[1] += weight * value
+            elif weight > entry[0]:
+                entry[0] = weight
+                entry[1] = value
+        files += 1
+        logger.info("Merged %s, %d states so far.", input_file, len(merged))
+
+    brain = _LearnPlayerBrain(
+        None,
+        output_file,
+        storage=storage,
+        storage_range=storage_range,
+        storage_path=storage_path,
+        count_visits=True,
+    )
+    for code, (weight, total) in merged.items():
+        if weight:
+            brain.valuations[code] = total / weight if method == "visits" else total
+            brain.visits[code] = weight
+    brain.save()
+    logger.info(
+        "Merged %d brains into %s by %s, %d states.",
+        files,
+        output_file,
+        method,
+        len(merged),
+    )
+    return brain
@@ -0,0 +1,128 @@
+import json
+import logging
+import sys
+import time
+
+from oxlearn.board import BoardSymbol as _BoardSymbol
+from oxlearn.play import GameResult as _GameResult
+
+from oxlearn.training.evaluation import policy_optimality as _policy_optimality
+from oxlearn.training.learnplayer import LearnPlayerBrain as _LearnPlayerBrain
+from oxlearn.training.learnplayer import ValueChangeTracker as _ValueChangeTracker
+from oxlearn.training.snapshot import SnapshotPublisher as _SnapshotPublisher
+from oxlearn.training.storage import SQLiteStore as _SQLiteStore
+
+logger = logging.getLogger(__name__)
+
+
+class TrainingMetrics:
+    def __init__(
+        self,
+        brain: _LearnPlayerBrain,
+        *,
+        every_games: int | None = None,
+        every_seconds: float | None = None,
+        output_file: str | None = None,
+        progress: bool = False,
+        optimality: bool = False,
+        snapshots: _SnapshotPublisher | None = None,
+    ):
+        self._brain = brain
+        self._every_games = every_games
+        self._every_seconds = every_seconds
+        self._output_file = output_file
+        self._progress = progress
+        self._optimality = optimality
+        self._snapshots = snapshots
+        self._tracker = _ValueChangeTracker()
+        self._output = None
+        self._total_games = 0
+        self._start_time = time.perf_counter()
+        self._reset_window(self._start_time)
+
+    def start(self) -> None:
+        self._brain.add_tracker(self._tracker)
+        if self._output_file is not None:
+            self._output = open(self._output_file, "a")
+        self._start_time = time.perf_counter()
+        self._reset_window(self._start_time)
+
+    def close(self) -> None:
+        if self._window_games:
+            self.emit()
+        self._brain.remove_tracker(self._tracker)
+        if self._output is not None:
+            self._output.close()
+            self._output = None
+        if self._progress:
+            print(file=sys.stderr)
+
+    def record(self, result: _GameResult) -> None:
+        self._total_games += 1
+        self._window_games += 1
+        self._window_moves += len(result.moves)
+        self._window_outcomes[result.winner] += 1
+
+        if self._every_games is not None and self._window_games >= self._every_games:
+            self.emit()
+        elif self._every_seconds is not None:
+            if time.perf_counter() - self._window_start >= self._every_seconds:
+                self.emit()
+
+    def emit(self) -> dict:
+        now = time.perf_counter()
+        elapsed = max(now - self._window_start, 1e-9)
+        games = max(self._window_games, 1)
+        record = {
+            "games": self._total_games,
+            "elapsed": round(now - self._start_time, 3),
+            "window_games": self._window_games,
+            "games_per_sec": self._window_games / elapsed,
+            "moves_per_sec": self._window_moves / elapsed,
+            "o_rate": self._window_outcomes[_BoardSymbol.O] / games,
+            "x_rate": self._window_outcomes[_BoardSymbol.X] / games,
+            "draw_rate": self._window_outcomes[None] / games,
+            "updated_entries": len(self._tracker.updated),
+            "mean_abs_change": self._tracker.mean_change,
+            "max_abs_change": self._tracker.max_change,
+        }
+        if self._optimality:
+            report = _policy_optimality(self._brain)
+            record["optimal_rate"] = report.optimal_rate
+            record["blunders"] = report.blunders
+        if isinstance(self._brain.valuations, _SQLiteStore):
+            record["cache_hit_rate"] = self._brain.valuations.hit_rate
+        if self._snapshots is not None and self._snapshots.snapshot is not None:
+            record.update(self._snapshots.stats())
+        logger.info("Training metrics: %s", record)
+        if self._output is not None:
+            self._output.write(json.dumps(record) + "\n")
+            self._output.flush()
+        if self._progress:
+            print(
+                f"\r{record['games']} games"
+                f" | {record['games_per_sec']:.0f} games/s"
+                f" | {record['moves_per_sec']:.0f} moves/s"
+                f" | O {record['o_rate']:.1%} X {record['x_rate']:.1%}"
+                f" draw {record['draw_rate']:.1%}"
+                f" | {record['updated_entries']} updated"
+                f" | mean {record['mean_abs_change']:.2e}"
+                f" max {record['max_abs_change']:.2e}"
+                + (
+                    f" | {record['optimal_rate']:.1%} optimal"
+                    if self._optimality
+                    else ""
+                ),
+                end="",
+                file=sys.stderr,
+                flush=True,
+            )
+        self._reset_window(now)
+        return record
+
+    def _reset_window(self, now: float) -> None:
+        self._window_start = now
+        self._window_games = 0
+        self._window_moves = 0
+        self._window_outcomes = {_BoardSymbol.O: 0, _BoardSymbol.X: 0, None: 0}
+        self._tracker.reset()
@@ -0,0 +1,209 @@
+import functools
+import heapq
+import logging
+
+from oxlearn import board as _board
+from oxlearn import rollout as _rollout
+from oxlearn.board import Board as _Board
+from oxlearn.board import BoardSymbol as _BoardSymbol
+
+from oxlearn.training.dihedral import canonical_table as _canonical_table
+from oxlearn.training.learnplayer import LearnPlayerBrain as _LearnPlayerBrain
+from oxlearn.training.learnplayer import ValueChangeTracker as _ValueChangeTracker
+
+logger = logging.getLogger(__name__)
+
+
+# Planning works on the same values as LearnPlayerBrain.learn: the value of an
+# afterstate, a canonical board just moved into, for the player who moved. At
+# a fixed point of learn under self-play each afterstate is worth decay_rate
+# times the reward if the game is over after it or after the opponent's reply,
+# and otherwise decay_rate times the value of the player's next afterstate.
+# Both sides choose moves like get_move, greedily with the same tie breaking,
+# taking a uniformly random move with probability exploration_rate.
+class RewardModel:
+    def __init__(
+        self,
+        *,
+        decay_rate: float,
+        o_reward_win: float,
+        o_reward_loss: float,
+        o_reward_draw: float,
+        x_reward_win: float,
+        x_reward_loss: float,
+        x_reward_draw: float,
+        exploration_rate: float = 0.0,
+        **kwargs,
+    ):
+        self.decay_rate = decay_rate
+        self.exploration_rate = exploration_rate
+        self._rewards = {
+            _BoardSymbol.O: (o_reward_win, o_reward_loss, o_reward_draw),
+            _BoardSymbol.X: (x_reward_win, x_reward_loss, x_reward_draw),
+        }
+
+    def reward(self, symbol: _BoardSymbol, board_code: int) -> float:
+        win, loss, draw = self._rewards[symbol]
+        winner = _board._winner.get(board_code)
+        if winner is None:
+            return draw
+        return win if winner == symbol else loss
+
+
+@functools.cache
+def options(canon_code: int) -> tuple[int, ...]:
+    # Canonical boards reachable in one move, in the order get_move sees them.
+    table = _canonical_table()
+    board = _Board(canon_code)
+    return tuple(table[(board + pos).encoded][0] for pos in board.available_positions)
+
+
+def backup(brain: _LearnPlayerBrain, model: RewardModel, canon_code: int) -> float:
+    _rollout.init_tables()
+    symbol = _rollout.movers[canon_code]
+    if _Board(canon_code).game_over:
+        return model.decay_rate * model.reward(symbol, canon_code)
+    value = 0.0
+    for reply, p_reply in _policy(brain, model, canon_code):
+        if _Board(reply).game_over:
+            target = model.reward(symbol, reply)
+        else:
+            # Finished games are worth their known reward rather than whatever
+            # learning has got their value to so far.
+            target = sum(
+                p
+                * (
+                    model.decay_rate * model.reward(symbol, afterstate)
+                    if _Board(afterstate).game_over
+                    else brain.value(afterstate)
+                )
+                for afterstate, p in _policy(brain, model, reply)
+            )
+        value += p_reply * target
+    return model.decay_rate * value
+
+
+def afterstates_by_ply(brain: _LearnPlayerBrain) -> list[list[int]]:
+    plies = [[] for _ in range(_Board.size + 1)]
+    for canon_code in brain.canonical_codes():
+        n_pieces = sum(1 for v in _Board(canon_code).representation if v != 0)
+        if n_pieces:
+            plies[n_pieces].append(canon_code)
+    return plies
+
+
+def value_iteration(
+    brain: _LearnPlayerBrain,
+    model: RewardModel,
+    *,
+    tolerance: float = 1e-9,
+    max_sweeps: int = 100,
+) -> int:
+    # Sweeping from the last ply back to the first means every backup already
+    # sees final values for the plies after it, so one sweep reaches the fixed
+    # point and the next one confirms it.
+    plies = afterstates_by_ply(brain)
+    for sweep in range(1, max_sweeps + 1):
+        max_change = 0.0
+        for ply in reversed(plies):
+            for canon_code in ply:
+                value = backup(brain, model, canon_code)
+                max_change = max(max_change, abs(value - brain.value(canon_code)))
+                brain.set_value(canon_code, value)
+        logger.info("Value iteration sweep %d max change %.03e.", sweep, max_change)
+        if max_change < tolerance:
+            return sweep
+    return max_sweeps
+
+
+@functools.cache
+def dependents(canon_code: int) -> tuple[int, ...]:
+    # Canonical afterstates whose backup reads this one's value: those one ply
+    # back choose between it and its siblings, those two plies back take it as
+    # their target.
+    table = _canonical_table()
+    parents = {
+        table[code][0] for code in _board._backwards.get(canon_code, {}).values()
+    }
+    grandparents = {
+        table[code][0]
+        for parent in parents
+        for code in _board._backwards.get(parent, {}).values()
+    }
+    return tuple(sorted((parents | grandparents) - {0}))
+
+
+# Registered with the brain like any other tracker, so every value change made
+# by learning, or by its own backups, queues the states that depend on it.
+# sweep then backs up the most urgent queued states.
+class PrioritizedSweeper(_ValueChangeTracker):
+    _queue: list[tuple[float, int]]
+    _priorities: dict[int, float]
+
+    def __init__(
+        self,
+        model: RewardModel,
+        *,
+        threshold: float = 1e-4,
+        backups_per_game: int = 100,
+    ):
+        super().__init__()
+        self._model = model
+        self._threshold = threshold
+        self._backups_per_game = backups_per_game
+        self._brain = None
+        self._queue = []
+        self._priorities = {}
+        self.backups = 0
+
+    def start(self, brain: _LearnPlayerBrain) -> None:
+        self._brain = brain
+        brain.add_tracker(self)
+
+    def close(self) -> None:
+        self._brain.remove_tracker(self)
+        self._brain = None
+
+    def add(self, canon_code: int, change: float) -> None:
+        super().add(canon_code, change)
+        if change <= self._threshold:
+            return
+        for code in dependents(canon_code):
+            if change > self._priorities.get(code, 0.0):
+                self._priorities[code] = change
+                heapq.heappush(self._queue, (-change, code))
+
+    def sweep(self) -> int:
+        n_backups = 0
+        while self._queue and n_backups < self._backups_per_game:
+            priority, code = heapq.heappop(self._queue)
+            if self._priorities.get(code) != -priority:
+                # Superseded by a later push with a higher priority.
+                continue
+            del self._priorities[code]
+            self._brain.set_value(code, backup(self._brain, self._model, code))
+            n_backups += 1
+        self.backups += n_backups
+        return n_backups
+
+    def __len__(self) -> int:
+        return len(self._priorities)
+
+
+def _policy(
+    brain: _LearnPlayerBrain, model: RewardModel, canon_code: int
+) -> list[tuple[int, float]]:
+    moves = options(canon_code)
+    # Same tie breaking as get_move: the last of the best options wins.
+    greedy = 0
+    value_max = None
+    for i, move in enumerate(moves):
+        value = brain.value(move)
+        if value_max is None or value >= value_max:
+            value_max = value
+            greedy = i
+    explore = model.exploration_rate / len(moves)
+    return [
+        (move, explore + (1.0 - model.exploration_rate if i == greedy else 0.0))
+        for i, move in enumerate(moves)
+    ]
@@ -0,0 +1,119 @@
+import array
+import logging
+import random
+
+from oxlearn.board import Board as _Board
+from oxlearn.board import BoardSymbol as _BoardSymbol
+
+from oxlearn.training.learnplayer import LearnPlayer as _LearnPlayer
+from oxlearn.training.learnplayer import ValueChangeTracker as _ValueChangeTracker
+
+logger = logging.getLogger(__name__)
+
+_no_move = 0xFF
+_min_priority = 1e-3
+
+
+# Fixed capacity ring buffer of finished games. Each game is stored as a row
+# of Board.size uint8 moves padded with 0xFF, plus the winner (0 for a draw),
+# a bit mask of the sides that learn from it and a replay priority.
+class ReplayBuffer:
+    def __init__(self, capacity: int):
+        self._capacity = capacity
+        self._moves = array.array("B", [_no_move]) * (capacity * _Board.size)
+        self._winners = array.array("B", [0]) * capacity
+        self._sides = array.array("B", [0]) * capacity
+        self._priorities = array.array("d", [0.0]) * capacity
+        self._next = 0
+        self._size = 0
+        self._max_priority = 1.0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    def add(
+        self,
+        moves: list[int],
+        winner: _BoardSymbol | None,
+        sides: tuple[_BoardSymbol, ...] = (_BoardSymbol.O, _BoardSymbol.X),
+    ) -> int:
+        index = self._next
+        row = index * _Board.size
+        self._moves[row : row + _Board.size] = array.array(
+            "B", list(moves) + [_no_move] * (_Board.size - len(moves))
+        )
+        self._winners[index] = 0 if winner is None else int(winner)
+        self._sides[index] = sum(1 << int(side) for side in sides)
+        # New games are replayed at least once before their error is known.
+        self._priorities[index] = self._max_priority
+        self._next = (index + 1) % self._capacity
+        self._size = min(self._size + 1, self._capacity)
+        return index
+
+    def moves(self, index: int) -> list[int]:
+        row = index * _Board.size
+        return [m for m in self._moves[row : row + _Board.size] if m != _no_move]
+
+    def winner(self, index: int) -> _BoardSymbol | None:
+        winner = self._winners[index]
+        return None if winner == 0 else _BoardSymbol(winner)
+
+    def sides(self, index: int) -> list[_BoardSymbol]:
+        return [s for s in _BoardSymbol if self._sides[index] & (1 << int(s))]
+
+    def histories(self, index: int) -> dict[_BoardSymbol, list[int]]:
+        histories = {_BoardSymbol.O: [], _BoardSymbol.X: []}
+        board = _Board(0)
+        symbol = _BoardSymbol.first
+        for pos in self.moves(index):
+            board += pos
+            histories[symbol].append(board.encoded)
+            symbol = symbol.next
+        return histories
+
+    def sample(
+        self, n: int, rng: random.Random, prioritized: bool = False
+    ) -> list[int]:
+        if prioritized:
+            return rng.choices(range(self._size), self._priorities[: self._size], k=n)
+        return [int(rng.random() * self._size) for _ in range(n)]
+
+    def priority(self, index: int) -> float:
+        return self._priorities[index]
+
+    def update_priority(self, index: int, priority: float) -> None:
+        priority = max(priority, _min_priority)
+        self._priorities[index] = priority
+        if priority > self._max_priority:
+            self._max_priority = priority
+
+
+# Replays sampled games through the players that are learning, so each side
+# learns from them with its own update rule, rewards and rates.
+def replay(
+    players: dict[_BoardSymbol, _LearnPlayer],
+    buffer: ReplayBuffer,
+    batch_size: int,
+    *,
+    rng: random.Random,
+    prioritized: bool = False,
+) -> None:
+    if not len(buffer):
+        return
+    brain = players[_BoardSymbol.O].brain
+    tracker = _ValueChangeTracker()
+    brain.add_tracker(tracker)
+    try:
+        for index in buffer.sample(batch_size, rng, prioritized):
+            tracker.reset()
+            winner = buffer.winner(index)
+            histories = buffer.histories(index)
+            for side in buffer.sides(index):
+                players[side].replay(histories[side], winner)
+            buffer.update_priority(index, tracker.mean_change)
+    finally:
+        brain.remove_tracker(tracker)
@@ -0,0 +1,172 @@
+import array
+import logging
+import struct
+import sys
+import typing
+
+from multiprocessing import resource_tracker as _resource_tracker
+from multiprocessing import shared_memory as _shared_memory
+
+from oxlearn import board as _board
+from oxlearn.board import Board as _Board
+
+from oxlearn.training.dihedral import Dihedral as _Dihedral
+from oxlearn.training.dihedral import canonical_table as _canonical_table
+from oxlearn.training.learnplayer import LearnPlayerBrain as _LearnPlayerBrain
+
+logger = logging.getLogger(__name__)
+
+# Layout of the shared block, every table indexed by board code:
+#   header       two uint64, the version being written and the last published
+#   canon        int32, canonical board code
+#   trans        uint8, index of the transformation with trans * canon = board
+#   afterstates  int32 per position, canonical board after the move or -1
+#   values       two float64 tables, version v lives in table v % 2
+_codes = 3**_Board.size
+_header = struct.Struct("QQ")
+_canon_offset = _header.size
+_trans_offset = _canon_offset + 4 * _codes
+_afterstates_offset = _trans_offset + (_codes + 7) // 8 * 8
+_values_offset = _afterstates_offset + 4 * _codes * _Board.size
+_size = _values_offset + 2 * 8 * _codes
+
+_transforms = list(_Dihedral)
+
+
+# Owns the shared block. publish writes the brain's values into the table
+# readers are not using and then bumps the version, so readers see either the
+# old values or the new ones, never a mix.
+class SharedBrainPublisher:
+    def __init__(self, brain: _LearnPlayerBrain, *, name: str | None = None):
+        self._brain = brain
+        self._shm = _shared_memory.SharedMemory(name=name, create=True, size=_size)
+        self._header = self._shm.buf[: _header.size].cast("Q")
+        self._values = self._shm.buf[_values_offset:_size].cast("d")
+        self._write_indexes()
+        self.version = 0
+        self.publish()
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    def publish(self) -> int:
+        version = self.version + 1
+        dense = array.array("d", bytes(8 * _codes))
+        for canon_code, value in self._brain.valuations.items():
+            dense[canon_code] = value
+        base = version % 2 * _codes
+        self._header[0] = version
+        self._values[base : base + _codes] = dense
+        self._header[1] = version
+        self.version = version
+        logger.info("Published shared brain %s version %d.", self.name, version)
+        return version
+
+    def close(self) -> None:
+        del self._header, self._values
+        self._shm.close()
+        if sys.version_info < (3, 13):
+            # Processes started through multiprocessing share this process's
+            # resource tracker, so a reader among them has dropped the block
+            # from it, and unlink expects to find it there.
+            _resource_tracker.register("/" + self.name, "shared_memory")
+        self._shm.unlink()
+
+    def _write_indexes(self) -> None:
+        buf = self._shm.buf
+        table = _canonical_table()
+        canon = array.array("i", bytes(4 * _codes))
+        trans = array.array("B", bytes(_codes))
+        afterstates = array.array("i", [-1]) * (_codes * _Board.size)
+        for board_code, (canon_code, transform) in table.items():
+            canon[board_code] = canon_code
+            trans[board_code] = _transforms.index(transform)
+            for pos, child in _board._movement.get(board_code, {}).items():
+                afterstates[board_code * _Board.size + pos] = table[child][0]
+        buf[_canon_offset:_trans_offset].cast("i")[:] = canon
+        buf[_trans_offset : _trans_offset + _codes] = trans
+        buf[_afterstates_offset:_values_offset].cast("i")[:] = afterstates
+
+
+# Attaches to a published block by name without copying it. Each call reads
+# one consistent version, whichever was last published when it started, and
+# retries if the publisher got round to overwriting that table meanwhile.
+class SharedBrain:
+    def __init__(self, name: str):
+        if sys.version_info >= (3, 13):
+            self._shm = _shared_memory.SharedMemory(name=name, track=False)
+        else:
+            self._shm = _shared_memory.SharedMemory(name=name)
+            # Only the publisher may unlink the block when it is done with it.
+            # The tracker knows it by its POSIX name, with the leading slash.
+            _resource_tracker.unregister("/" + self._shm.name, "shared_memory")
+        buf = self._shm.buf.toreadonly()
+        self._header = buf[: _header.size].cast("Q")
+        self._canon = buf[_canon_offset:_trans_offset].cast("i")
+        self._trans = buf[_trans_offset : _trans_offset + _codes]
+        self._afterstates = buf[_afterstates_offset:_values_offset].cast("i")
+        self._values = buf[_values_offset:_size].cast("d")
+        self._positions = [
+            [t * pos for pos in _Board.all_positions()] for t in _transforms
+        ]
+
+    @property
+    def version(self) -> int:
+        return self._header[1]
+
+    def value(self, board_code: int) -> float:
+        while True:
+            version = self._header[1]
+            value = self._values[version % 2 * _codes + self._canon_code(board_code)]
+            if self._consistent(version):
+                return value
+
+    def get_moves(self, board_codes: typing.Iterable[int]) -> list[int | None]:
+        # LearnPlayerBrain.get_moves on the shared values.
+        board_codes = list(board_codes)
+        while True:
+            version = self._header[1]
+            base = version % 2 * _codes
+            moves = [self._greedy_move(board_code, base) for board_code in board_codes]
+            if self._consistent(version):
+                return moves
+
+    def greedy_move(self, board_code: int) -> int | None:
+        return self.get_moves((board_code,))[0]
+
+    def close(self) -> None:
+        # Views into the block must go before it can be closed.
+        del self._header, self._canon, self._trans, self._afterstates, self._values
+        self._shm.close()
+
+    def _consistent(self, version: int) -> bool:
+        # Writing the table for version + 2 reuses this version's table.
+        return self._header[0] < version + 2
+
+    def _canon_code(self, board_code: int) -> int:
+        # Codes that are not boards have no entry, which reads as the empty
+        # board's.
+        canon_code = self._canon[board_code] if 0 <= board_code < _codes else 0
+        if canon_code == 0 and board_code != 0:
+            raise ValueError(f"{board_code} is not a valid board code")
+        return canon_code
+
+    def _greedy_move(self, board_code: int, base: int) -> int | None:
+        # Same tie breaking as get_move: the last of the best options wins.
+        canon_code = self._canon_code(board_code)
+        afterstates = self._afterstates
+        values = self._values
+        value_max = -0xFFFF
+        next_pos = None
+        start = canon_code * _Board.size
+        for pos in _Board.all_positions():
+            afterstate = afterstates[start + pos]
+            if afterstate >= 0:
+                value = values[base + afterstate]
+                if value >= value_max:
+                    value_max = value
+                    next_pos = pos
+        if next_pos is None:
+            return None
+        return self._positions[self._trans[board_code]][next_pos]
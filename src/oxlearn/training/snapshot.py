@@ -0,0 +1,98 @@
+import logging
+import time
+import typing
+
+from oxlearn.play import GameResult as _GameResult
+
+from oxlearn.training.learnplayer import LearnPlayerBrain as _LearnPlayerBrain
+
+logger = logging.getLogger(__name__)
+
+
+# A frozen copy of a brain's values. It answers everything a brain does, with
+# the same tie breaking, and never changes once made.
+class BrainSnapshot(_LearnPlayerBrain):
+    def __init__(self, brain: _LearnPlayerBrain, version: int, games: int):
+        super().__init__(None, None)
+        self._board_valuation = brain.valuations.copy()
+        self.version = version
+        self.games = games
+        self.published = time.perf_counter()
+
+    def set_value(self, canon_code: int, value: float) -> None:
+        raise TypeError("Brain snapshots are read only")
+
+
+# Publishes a snapshot of a training brain every so many games or seconds.
+# Readers take publisher.snapshot, a plain attribute swapped in one step, and
+# keep using that snapshot for as long as they want a consistent view, so they
+# never need a lock.
+class SnapshotPublisher:
+    snapshot: BrainSnapshot | None
+    _listeners: list[typing.Callable[[BrainSnapshot], None]]
+
+    def __init__(
+        self,
+        brain: _LearnPlayerBrain,
+        *,
+        every_games: int | None = 1000,
+        every_seconds: float | None = None,
+    ):
+        self._brain = brain
+        self._every_games = every_games
+        self._every_seconds = every_seconds
+        self._listeners = []
+        self._games = 0
+        self._publish_time = 0.0
+        self.snapshot = None
+        self.publications = 0
+
+    def add_listener(self, callback: typing.Callable[[BrainSnapshot], None]) -> None:
+        self._listeners.append(callback)
+
+    def start(self) -> None:
+        if self.snapshot is None:
+            self.publish()
+
+    def record(self, result: _GameResult) -> None:
+        self._games += 1
+        if self._every_games is not None:
+            if self._games - self.snapshot.games >= self._every_games:
+                self.publish()
+        elif self._every_seconds is not None:
+            if time.perf_counter() - self.snapshot.published >= self._every_seconds:
+                self.publish()
+
+    def close(self) -> None:
+        if self._games != self.snapshot.games:
+            self.publish()
+
+    def publish(self) -> BrainSnapshot:
+        start = time.perf_counter()
+        version = 1 if self.snapshot is None else self.snapshot.version + 1
+        snapshot = BrainSnapshot(self._brain, version, self._games)
+        if self.snapshot is None:
+            self._first_published = snapshot.published
+        self.snapshot = snapshot
+        self.publications += 1
+        self._publish_time += time.perf_counter() - start
+        for callback in self._listeners:
+            callback(snapshot)
+        logger.info("Published brain snapshot %d after %d games.", version, self._games)
+        return snapshot
+
+    def stats(self) -> dict[str, float]:
+        snapshot = self.snapshot
+        now = time.perf_counter()
+        intervals = self.publications - 1
+        return {
+            "snapshot_version": snapshot.version,
+            "snapshot_interval": (
+                (snapshot.published - self._first_published) / intervals
+                if intervals
+                else 0.0
+            ),
+            "snapshot_publish_ms": 1000.0 * self._publish_time / self.publications,
+            "snapshot_lag_games": self._games - snapshot.games,
+            "snapshot_lag_seconds": now - snapshot.published,
+        }
@@ -0,0 +1,87 @@
+import logging
+import time
+
+from oxlearn.training.learnplayer import LearnPlayerBrain as _LearnPlayerBrain
+from oxlearn.training.learnplayer import ValueChangeTracker as _ValueChangeTracker
+
+logger = logging.getLogger(__name__)
+
+
+class StoppingCriterion:
+    reason: str | None
+
+    def __init__(
+        self,
+        *,
+        window: int = 1000,
+        max_update: float | None = None,
+        mean_update: float | None = None,
+        policy_stable_windows: int | None = None,
+        max_seconds: float | None = None,
+    ):
+        self._window = window
+        self._max_update = max_update
+        self._mean_update = mean_update
+        self._policy_stable_windows = policy_stable_windows
+        self._max_seconds = max_seconds
+        self._tracker = _ValueChangeTracker()
+        self._brain = None
+        self.reason = None
+
+    def start(self, brain: _LearnPlayerBrain) -> None:
+        self._brain = brain
+        self._brain.add_tracker(self._tracker)
+        self._start_time = time.perf_counter()
+        self._window_games = 0
+        self._policy = None
+        self._stable_windows = 0
+        self.reason = None
+
+    def close(self) -> None:
+        self._brain.remove_tracker(self._tracker)
+        self._brain = None
+
+    def should_stop(self) -> bool:
+        if self._max_seconds is not None:
+            if time.perf_counter() - self._start_time >= self._max_seconds:
+                return self._stop(f"time limit of {self._max_seconds}s reached")
+
+        self._window_games += 1
+        if self._window_games < self._window:
+            return False
+        self._window_games = 0
+
+        # A window without any updates says nothing about how far values are
+        # still moving, so the update criteria wait for one that has some.
+        tracker = self._tracker
+        if tracker.n_updates:
+            if self._max_update is not None and tracker.max_change < self._max_update:
+                return self._stop(
+                    f"max update {tracker.max_change:.3e} below {self._max_update}"
+                )
+            if (
+                self._mean_update is not None
+                and tracker.mean_change < self._mean_update
+            ):
+                return self._stop(
+                    f"mean update {tracker.mean_change:.3e} below {self._mean_update}"
+                )
+        tracker.reset()
+
+        if self._policy_stable_windows is not None:
+            policy = self._brain.greedy_policy()
+            if policy == self._policy:
+                self._stable_windows += 1
+            else:
+                self._stable_windows = 0
+            self._policy = policy
+            if self._stable_windows >= self._policy_stable_windows:
+                return self._stop(
+                    f"greedy policy unchanged for {self._stable_windows} windows"
+                )
+        return False
+
+    def _stop(self, reason: str) -> bool:
+        self.reason = reason
+        logger.info("Stopping training: %s.", reason)
+        return True
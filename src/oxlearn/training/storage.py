@@ -0,0 +1,419 @@
+import abc
+import array
+import collections
+import collections.abc
+import copy
+import functools
+import logging
+import math
+import random
+import sqlite3
+import struct
+import threading
+import typing
+
+from oxlearn.board import Board as _Board
+
+from oxlearn.training.dihedral import canonical_table as _canonical_table
+
+logger = logging.getLogger(__name__)
+
+# Not a value in either 16 bit format: a NaN as float16, and above the top of
+# the fixed point scale.
+_empty16 = 0xFFFF
+_f16 = struct.Struct("<e")
+_u16 = struct.Struct("<H")
+_f16_max = 65504.0
+_n_codes = 3**_Board.size
+
+
+# Values for canonical board codes held in one typed array, with a reserved
+# raw value for codes that have none, in place of a dict of boxed floats. The
+# slot of each canonical code comes from an index shared by every store.
+# Writes that fall between two representable values round up or down at random
+# in proportion to how close they are, so repeated small learning updates are
+# not lost to rounding on average.
+class ValueStore(collections.abc.MutableMapping):
+    quantization: str
+
+    def __init__(self, typecode: str, empty: float, rng: random.Random):
+        self._slots, self._codes = _canonical_slots()
+        self._values = array.array(typecode, [empty]) * len(self._codes)
+        self._empty = empty
+        self._rng = rng
+        self._len = 0
+        self.clamped = 0
+
+    def _clamp(self, value: float, low: float, high: float) -> float:
+        # Values outside what the store can hold are stored as the nearest one
+        # it can, counted in clamped, with a warning the first time.
+        if low <= value <= high:
+            return value
+        if not self.clamped:
+            logger.warning(
+                "Value %f is outside the %s storage range [%f, %f] and is clamped"
+                " to it.",
+                value,
+                self.quantization,
+                low,
+                high,
+            )
+        self.clamped += 1
+        return min(max(value, low), high)
+
+    @abc.abstractmethod
+    def _encode(self, value: float) -> float:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def _decode(self, raw: float) -> float:
+        raise NotImplementedError
+
+    @property
+    def spec(self) -> dict:
+        return {"quantization": self.quantization}
+
+    @property
+    def nbytes(self) -> int:
+        return self._values.itemsize * len(self._values)
+
+    def __getitem__(self, board_code: int) -> float:
+        slot = self._slots[board_code] if 0 <= board_code < _n_codes else -1
+        if slot < 0:
+            raise KeyError(board_code)
+        raw = self._values[slot]
+        if raw == self._empty or raw != raw:
+            raise KeyError(board_code)
+        return self._decode(raw)
+
+    def get(self, board_code: int, default: typing.Any = None) -> typing.Any:
+        slot = self._slots[board_code] if 0 <= board_code < _n_codes else -1
+        if slot < 0:
+            return default
+        raw = self._values[slot]
+        if raw == self._empty or raw != raw:
+            return default
+        return self._decode(raw)
+
+    def __setitem__(self, board_code: int, value: float) -> None:
+        slot = self._slots[board_code] if 0 <= board_code < _n_codes else -1
+        if slot < 0:
+            raise KeyError(f"{board_code} is not a canonical board code")
+        raw = self._values[slot]
+        if raw == self._empty or raw != raw:
+            self._len += 1
+        self._values[slot] = self._encode(value)
+
+    def __delitem__(self, board_code: int) -> None:
+        slot = self._slots[board_code] if 0 <= board_code < _n_codes else -1
+        if slot < 0:
+            raise KeyError(board_code)
+        raw = self._values[slot]
+        if raw == self._empty or raw != raw:
+            raise KeyError(board_code)
+        self._values[slot] = self._empty
+        self._len -= 1
+
+    def __iter__(self) -> typing.Iterator[int]:
+        empty = self._empty
+        for board_code, raw in zip(self._codes, self._values):
+            if raw != empty and raw == raw:
+                yield board_code
+
+    def __len__(self) -> int:
+        return self._len
+
+    def copy(self) -> "ValueStore":
+        other = copy.copy(self)
+        other._values = array.array(self._values.typecode, self._values)
+        return other
+
+
+class Float32Store(ValueStore):
+    quantization = "float32"
+
+    # Rounding to nearest loses less than a learning rate times the error
+    # could ever move a value, so there is no need to round at random.
+    def __init__(self, rng: random.Random):
+        super().__init__("f", math.nan, rng)
+
+    def _encode(self, value: float) -> float:
+        return value
+
+    def _decode(self, raw: float) -> float:
+        return raw
+
+
+class Float16Store(ValueStore):
+    quantization = "float16"
+
+    def __init__(self, rng: random.Random):
+        super().__init__("H", _empty16, rng)
+        self._table = _float16_table()
+
+    def _encode(self, value: float) -> int:
+        value = self._clamp(value, -_f16_max, _f16_max)
+        bits = _u16.unpack(_f16.pack(value))[0]
+        nearest = self._table[bits]
+        if nearest == value:
+            return bits
+        other = _float16_step(bits, 1 if nearest < value else -1)
+        other_value = self._table[other]
+        if self._rng.random() < (value - nearest) / (other_value - nearest):
+            return other
+        return bits
+
+    def _decode(self, raw: int) -> float:
+        return self._table[raw]
+
+
+class UInt16Store(ValueStore):
+    quantization = "uint16"
+
+    # Fixed point over [low, high], with the top raw value kept for empty.
+    def __init__(self, rng: random.Random, low: float, high: float):
+        super().__init__("H", _empty16, rng)
+        self._low = low
+        self._high = high
+        self._step = (high - low) / (_empty16 - 1)
+
+    @property
+    def spec(self) -> dict:
+        return {"quantization": self.quantization, "range": [self._low, self._high]}
+
+    def _encode(self, value: float) -> int:
+        value = self._clamp(value, self._low, self._high)
+        scaled = min((value - self._low) / self._step, _empty16 - 1.0)
+        raw = math.floor(scaled)
+        if raw < _empty16 - 1 and self._rng.random() < scaled - raw:
+            raw += 1
+        return raw
+
+    def _decode(self, raw: int) -> float:
+        return self._low + raw * self._step
+
+
+# Values kept in a SQLite file as pages of page_size float64s, one row per page,
+# so only the pages in use need to be in memory. Up to cache_pages recently
+# used pages are held in an LRU cache. Changed pages evicted from it are
+# written back write_batch at a time, and everything is written out by flush.
+# Like a dict it is for one thread at a time, but that need not be the thread
+# that opened it.
+class SQLiteStore(collections.abc.MutableMapping):
+    _cache: collections.OrderedDict[int, array.array]
+    _dirty: set[int]
+    _pending: dict[int, array.array]
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        page_size: int = 256,
+        cache_pages: int = 64,
+        write_batch: int = 16,
+    ):
+        self._path = path
+        self._page_size = page_size
+        self._cache_pages = cache_pages
+        self._write_batch = write_batch
+        self._cache = collections.OrderedDict()
+        self._dirty = set()
+        self._pending = {}
+        self.hits = 0
+        self.misses = 0
+        self.page_reads = 0
+        self.page_writes = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS pages (page INTEGER PRIMARY KEY, data BLOB)"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER)"
+        )
+        row = self._db.execute("SELECT value FROM meta WHERE key = 'count'").fetchone()
+        self._len = row[0] if row is not None else 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def __getitem__(self, board_code: int) -> float:
+        value = self._page(board_code // self._page_size)[board_code % self._page_size]
+        if value != value:
+            raise KeyError(board_code)
+        return value
+
+    def get(self, board_code: int, default: typing.Any = None) -> typing.Any:
+        value = self._page(board_code // self._page_size)[board_code % self._page_size]
+        return default if value != value else value
+
+    def __setitem__(self, board_code: int, value: float) -> None:
+        page_index = board_code // self._page_size
+        page = self._page(page_index)
+        old = page[board_code % self._page_size]
+        if old != old:
+            self._len += 1
+        page[board_code % self._page_size] = value
+        self._dirty.add(page_index)
+
+    def __delitem__(self, board_code: int) -> None:
+        page_index = board_code // self._page_size
+        page = self._page(page_index)
+        old = page[board_code % self._page_size]
+        if old != old:
+            raise KeyError(board_code)
+        page[board_code % self._page_size] = math.nan
+        self._len -= 1
+        self._dirty.add(page_index)
+
+    def __iter__(self) -> typing.Iterator[int]:
+        # Only the page numbers are read up front. Pages come in through the
+        # cache one at a time, so a loop over items() reads each page once
+        # and can change values as it goes.
+        self.flush()
+        with self._lock:
+            rows = self._db.execute("SELECT page FROM pages ORDER BY page")
+            page_indexes = [page_index for page_index, in rows]
+        for page_index in page_indexes:
+            start = page_index * self._page_size
+            for offset, value in enumerate(self._page(page_index)):
+                if value == value:
+                    yield start + offset
+
+    def __len__(self) -> int:
+        return self._len
+
+    def copy(self) -> "SQLiteStore":
+        # A copy in a temporary database, which SQLite deletes once the copy
+        # is closed or dropped.
+        self.flush()
+        other = SQLiteStore(
+            "",
+            page_size=self._page_size,
+            cache_pages=self._cache_pages,
+            write_batch=self._write_batch,
+        )
+        with self._lock:
+            self._db.backup(other._db)
+        other._len = self._len
+        return other
+
+    def flush(self) -> None:
+        for page_index in self._dirty:
+            self._pending[page_index] = self._cache[page_index]
+        self._dirty.clear()
+        self._write_pending()
+
+    def close(self) -> None:
+        self.flush()
+        with self._lock:
+            self._db.close()
+        logger.info(
+            "Closed %s. Cache hit rate %.03f, %d page reads, %d page writes.",
+            self._path,
+            self.hit_rate,
+            self.page_reads,
+            self.page_writes,
+        )
+
+    def _page(self, page_index: int) -> array.array:
+        page = self._cache.get(page_index)
+        if page is not None:
+            self.hits += 1
+            self._cache.move_to_end(page_index)
+            return page
+        self.misses += 1
+        page = self._pending.pop(page_index, None)
+        if page is not None:
+            # Evicted but not yet written back, so still changed.
+            self._dirty.add(page_index)
+        else:
+            page = self._read_page(page_index)
+        self._cache[page_index] = page
+        if len(self._cache) > self._cache_pages:
+            old_index, old_page = self._cache.popitem(last=False)
+            if old_index in self._dirty:
+                self._dirty.remove(old_index)
+                self._pending[old_index] = old_page
+                if len(self._pending) >= self._write_batch:
+                    self._write_pending()
+        return page
+
+    def _read_page(self, page_index: int) -> array.array:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT data FROM pages WHERE page = ?", (page_index,)
+            ).fetchone()
+        if row is None:
+            return array.array("d", [math.nan]) * self._page_size
+        self.page_reads += 1
+        return array.array("d", row[0])
+
+    def _write_pending(self) -> None:
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO pages (page, data) VALUES (?, ?)",
+                [(index, page.tobytes()) for index, page in self._pending.items()],
+            )
+            self._db.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('count', ?)",
+                (self._len,),
+            )
+        self.page_writes += len(self._pending)
+        self._pending.clear()
+
+
+@functools.cache
+def _canonical_slots() -> tuple[array.array, list[int]]:
+    # board code : slot of its value, or -1 for boards that are not canonical.
+    codes = sorted({canon_code for canon_code, _ in _canonical_table().values()})
+    slots = array.array("h", [-1]) * _n_codes
+    for slot, canon_code in enumerate(codes):
+        slots[canon_code] = slot
+    return slots, codes
+
+
+@functools.cache
+def _float16_table() -> list[float]:
+    return [_f16.unpack(_u16.pack(bits))[0] for bits in range(1 << 16)]
+
+
+def _float16_step(bits: int, direction: int) -> int:
+    # Next representable float16 above (direction 1) or below (-1).
+    if bits & 0x7FFF == 0:
+        return 0x0001 if direction > 0 else 0x8001
+    if (bits & 0x8000 == 0) == (direction > 0):
+        return bits + 1
+    return bits - 1
+
+
+storages = ["dict", "float32", "float16", "uint16", "sqlite"]
+
+
+def make_store(
+    name: str,
+    *,
+    value_range: tuple[float, float] = (-1.0, 1.0),
+    rng: random.Random | None = None,
+    path: str | None = None,
+) -> typing.MutableMapping[int, float]:
+    rng = rng if rng is not None else random.Random()
+    if name == "dict":
+        return {}
+    if name == "float32":
+        return Float32Store(rng)
+    if name == "float16":
+        return Float16Store(rng)
+    if name == "uint16":
+        return UInt16Store(rng, *value_range)
+    if name == "sqlite":
+        if path is None:
+            raise ValueError("SQLite value storage needs a file path")
+        return SQLiteStore(path)
+    raise ValueError(f"Unknown value storage '{name}'")
+
+
+def store_spec(store: typing.MutableMapping[int, float]) -> dict:
+    return store.spec if isinstance(store, ValueStore) else {"quantization": "dict"}
@@ -0,0 +1,154 @@
+import concurrent.futures
+import csv
+import itertools
+import json
+import logging
+import multiprocessing
+
+from oxlearn.rng import SeedSequence as _SeedSequence
+
+from oxlearn.training.dihedral import canonical_table as _canonical_table
+from oxlearn.training.evaluation import policy_optimality as _policy_optimality
+from oxlearn.training.evaluation import score_against_random as _score_against_random
+from oxlearn.training.learnplayer import LearnPlayerBrain as _LearnPlayerBrain
+
+logger = logging.getLogger(__name__)
+
+sweep_parameters = [
+    "exploration_rate",
+    "exploration_final",
+    "exploration_decay_games",
+    "learn_rate",
+    "decay_rate",
+    "td_lambda",
+    "o_reward_win",
+    "o_reward_loss",
+    "o_reward_draw",
+    "x_reward_win",
+    "x_reward_loss",
+    "x_reward_draw",
+]
+
+
+# A sweep spec is a JSON object holding either
+#   {"grid": {"learn_rate": [0.1, 0.2], ...}}
+# to try every combination of the listed values, or
+#   {"random": {"samples": 20, "learn_rate": [0.05, 0.5], ...}}
+# to draw the given number of configurations uniformly from [low, high] ranges.
+def load_spec(file: str) -> dict:
+    with open(file, "r") as f:
+        spec = json.load(f)
+    if ("grid" in spec) == ("random" in spec):
+        raise ValueError("Sweep spec must contain exactly one of 'grid' or 'random'")
+    space = spec.get("grid", spec.get("random"))
+    for key in space:
+        if key not in sweep_parameters and key != "samples":
+            raise ValueError(f"Unknown sweep parameter '{key}'")
+    return spec
+
+
+def configurations(
+    spec: dict, base: dict[str, float], seed: _SeedSequence
+) -> list[dict[str, float]]:
+    configs = []
+    if "grid" in spec:
+        grid = spec["grid"]
+        keys = list(grid.keys())
+        for values in itertools.product(*(grid[k] for k in keys)):
+            configs.append({**base, **dict(zip(keys, values))})
+    else:
+        space = dict(spec["random"])
+        n_samples = space.pop("samples")
+        rng = seed.generator()
+        for _ in range(n_samples):
+            config = dict(base)
+            for key, (low, high) in space.items():
+                config[key] = rng.uniform(low, high)
+            configs.append(config)
+    return configs
+
+
+def run_sweep(
+    configs: list[dict[str, float]],
+    n_games: int,
+    *,
+    seed: _SeedSequence,
+    workers: int | None = None,
+) -> list[dict]:
+    # Build the shared tables before the pool forks so workers inherit them.
+    _canonical_table()
+
+    context = None
+    if "fork" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("fork")
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=workers, mp_context=context
+    ) as executor:
+        futures = [
+            executor.submit(_run_config, index, config, n_games, seed)
+            for index, config in enumerate(configs)
+        ]
+        results = []
+        for future in concurrent.futures.as_completed(futures):
+            result = future.result()
+            logger.info(
+                "Sweep run %d scored %.04f: %s",
+                result["index"],
+                result["score"],
+                result["config"],
+            )
+            results.append(result)
+    results.sort(key=lambda r: r["index"])
+    return results
+
+
+def best_result(results: list[dict]) -> dict:
+    # Ties go to the earliest configuration.
+    return max(results, key=lambda r: (r["score"], -r["index"]))
+
+
+def write_results(file: str, results: list[dict]) -> None:
+    with open(file, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["index", *sweep_parameters, "score", "optimal"])
+        for result in results:
+            writer.writerow(
+                [
+                    result["index"],
+                    *(result["config"][k] for k in sweep_parameters),
+                    result["score"],
+                    result["optimal"],
+                ]
+            )
+
+
+def format_results(results: list[dict]) -> str:
+    columns = ["index", *sweep_parameters, "score", "optimal"]
+    lines = [" ".join(f"{k:>16}" for k in columns)]
+    for result in results:
+        row = [f"{result['index']:>16}"]
+        row.extend(f"{result['config'][k]:>16.4f}" for k in sweep_parameters)
+        row.append(f"{result['score']:>16.4f}")
+        row.append(f"{result['optimal']:>16.4f}")
+        lines.append(" ".join(row))
+    return "\n".join(lines)
+
+
+def _run_config(
+    index: int,
+    config: dict[str, float],
+    n_games: int,
+    seed: _SeedSequence,
+) -> dict:
+    # Imported here to avoid a circular import with the package __init__.
+    from oxlearn.training import training_routine
+
+    brain = _LearnPlayerBrain(None, None)
+    training_routine(n_games, brain, seed=seed.child(index), **config)
+    return {
+        "index": index,
+        "config": config,
+        "score": _score_against_random(brain),
+        "optimal": _policy_optimality(brain).optimal_rate,
+        "values": brain.valuations,
+    }
@@ -0,0 +1,66 @@
+import logging
+
+from oxlearn.board import Board as _Board
+from oxlearn.board import BoardSymbol as _BoardSymbol
+
+from oxlearn.training.learnplayer import LearnPlayer as _LearnPlayer
+
+logger = logging.getLogger(__name__)
+
+
+# Learns online with TD(lambda) on the player's own afterstates instead of
+# sweeping backwards over the history once the game is over. Each afterstate
+# is moved towards decay_rate times the value of the player's next afterstate,
+# or decay_rate times the reward at the end of the game, matching the targets
+# LearnPlayerBrain.learn uses, so the values stay usable by TrainedPlayer.
+class TDLearnPlayer(_LearnPlayer):
+    _traces: dict[int, float]
+    _last_board: int | None
+
+    def __init__(self, symbol: _BoardSymbol, *, td_lambda: float = 0.8, **kwargs):
+        super().__init__(symbol, **kwargs)
+        self._td_lambda = td_lambda
+        self._traces = {}
+        self._last_board = None
+
+    def move(self, board: _Board) -> int:
+        pos = super().move(board)
+        next_board = self._history[-1]
+        if self._last_board is not None:
+            self._update(self._decay_rate * self.brain.value(next_board))
+        self._last_board = next_board
+        return pos
+
+    def _learn(self, reward: float) -> None:
+        if self._last_board is not None:
+            self._update(self._decay_rate * reward)
+        self._traces = {}
+        self._last_board = None
+        self._history = []
+        self._games_played += 1
+
+    def _learn_history(self, history: list[int], reward: float) -> None:
+        # The updates move and _learn would have made over the whole game,
+        # for replaying a finished one.
+        traces = {}
+        for i, board_code in enumerate(history):
+            if i + 1 < len(history):
+                target = self._decay_rate * self.brain.value(history[i + 1])
+            else:
+                target = self._decay_rate * reward
+            self.brain.learn_td(
+                traces,
+                board_code,
+                target,
+                self._learn_rate,
+                self._decay_rate * self._td_lambda,
+            )
+
+    def _update(self, target: float) -> None:
+        self.brain.learn_td(
+            self._traces,
+            self._last_board,
+            target,
+            self._learn_rate,
+            self._decay_rate * self._td_lambda,
+        )
@@ -0,0 +1,115 @@
+import asyncio
+import multiprocessing
+import threading
+
+import pytest
+
+from oxlearn.rng import SeedSequence
+from oxlearn.training import LearnPlayerBrain
+from oxlearn.training import learning_players
+from oxlearn.training import training_routine
+from oxlearn.training.distributed import Coordinator
+from oxlearn.training.distributed import run_worker
+from oxlearn.training.evaluation import score_against_random
+
+player_args = {
+    "exploration_rate": 0.3,
+    "learn_rate": 0.2,
+    "decay_rate": 0.9,
+    "o_reward_win": 1.0,
+    "o_reward_loss": 0.0,
+    "o_reward_draw": 0.1,
+    "x_reward_win": 1.0,
+    "x_reward_loss": 0.0,
+    "x_reward_draw": 0.5,
+}
+
+
+def _start(coordinator: Coordinator) -> threading.Thread:
+    started = threading.Event()
+
+    async def coordinate() -> None:
+        await coordinator.start("127.0.0.1", 0)
+        started.set()
+        await coordinator.wait()
+
+    thread = threading.Thread(target=asyncio.run, args=(coordinate(),))
+    thread.start()
+    started.wait()
+    return thread
+
+
+def test_distributed_training():
+    brain = LearnPlayerBrain(None, None)
+    coordinator = Coordinator(brain, 6000, refresh_change=0.5)
+    thread = _start(coordinator)
+    host, port = coordinator.address
+    workers = [
+        threading.Thread(
+            target=run_worker,
+            args=(host, port),
+            kwargs={"seed": SeedSequence(1), "batch_games": 500, **player_args},
+        )
+        for _ in range(3)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    thread.join()
+
+    stats = coordinator.stats
+    assert len(stats) == 3
+    assert sum(s.games for s in stats) == coordinator.games >= 6000
+    assert all(s.batches > 0 and s.games_per_sec > 0 for s in stats)
+    assert coordinator.version > 0
+    assert score_against_random(brain) > 0.85
+
+
+def test_single_worker_matches_local_training():
+    # With one worker nothing else is merged, so its batches go in at full
+    # weight. Its players carry on from batch to batch, exploration schedule
+    # included, so the table ends up as if trained locally in one run.
+    args = {
+        **player_args,
+        "exploration_schedule": "linear",
+        "exploration_final": 0.05,
+        "exploration_decay_games": 800,
+    }
+    brain = LearnPlayerBrain(None, None)
+    coordinator = Coordinator(brain, 800)
+    thread = _start(coordinator)
+    context = multiprocessing.get_context("spawn")
+    process = context.Process(
+        target=run_worker,
+        args=coordinator.address,
+        kwargs={"seed": SeedSequence(5), "batch_games": 200, **args},
+    )
+    process.start()
+    process.join()
+    thread.join()
+    assert process.exitcode == 0
+    assert [(s.batches, s.rejected, s.updates) for s in coordinator.stats] == [
+        (4, 0, 0)
+    ]
+
+    local = LearnPlayerBrain(None, None)
+    training_routine(800, local, seed=SeedSequence(5).child(0), **args)
+    for code in local.canonical_codes():
+        assert brain.value(code) == pytest.approx(local.value(code), abs=1e-12)
+
+
+def test_exploration_carries_over_batches():
+    brain = LearnPlayerBrain(None, None)
+    args = {
+        **player_args,
+        "exploration_schedule": "linear",
+        "exploration_final": 0.0,
+        "exploration_decay_games": 400,
+    }
+    players = learning_players(brain, seed=SeedSequence(6), **args)
+    rates = []
+    for batch in range(2):
+        training_routine(100, brain, seed=SeedSequence(6), players=players)
+        rates.append([player.exploration_rate(0) for player in players])
+    assert rates == [pytest.approx([0.225, 0.225]), pytest.approx([0.15, 0.15])]
@@ -0,0 +1,77 @@
+from oxlearn.training import LearnPlayerBrain
+from oxlearn.training import RewardModel
+from oxlearn.training import value_iteration
+from oxlearn.training import evaluation
+
+
+def planned_brain() -> LearnPlayerBrain:
+    brain = LearnPlayerBrain(None, None)
+    value_iteration(
+        brain,
+        RewardModel(
+            decay_rate=0.9,
+            o_reward_win=1.0,
+            o_reward_loss=0.0,
+            o_reward_draw=0.1,
+            x_reward_win=1.0,
+            x_reward_loss=0.0,
+            x_reward_draw=0.5,
+            exploration_rate=0.3,
+        ),
+    )
+    return brain
+
+
+def test_policy_optimality():
+    report = evaluation.policy_optimality(LearnPlayerBrain(None, None))
+    assert report.states == 4520
+    assert sum(p.states for p in report.plies.values()) == report.states
+    assert report.blunders > 0
+    assert report.optimal_rate < 1.0
+
+    report = evaluation.policy_optimality(planned_brain())
+    assert report.optimal == report.states
+    assert report.blunders == 0
+
+
+def test_expected_outcome():
+    result = evaluation.expected_outcome(
+        evaluation.random_policy(), evaluation.random_policy()
+    )
+    assert abs(result.o_win - 0.5849) < 1e-4
+    assert abs(result.x_win - 0.2881) < 1e-4
+    assert abs(result.draw - 0.1270) < 1e-4
+
+    perfect = evaluation.perfect_policy()
+    result = evaluation.expected_outcome(perfect, perfect)
+    assert result.draw == 1.0
+
+    brain = planned_brain()
+    result = evaluation.expected_outcome(
+        evaluation.brain_policy(brain, 0.3), evaluation.random_policy()
+    )
+    assert abs(sum(result) - 1.0) < 1e-9
+    assert evaluation.score_against_random(brain) > 0.9
+
+
+def test_expected_outcome_cache(monkeypatch):
+    searches = []
+    search = evaluation._search
+
+    def counted(policy_o, policy_x):
+        searches.append((policy_o, policy_x))
+        return search(policy_o, policy_x)
+
+    monkeypatch.setattr(evaluation, "_search", counted)
+    perfect = evaluation.perfect_policy()
+    greedy = evaluation.brain_policy(planned_brain())
+    result = evaluation.expected_outcome(perfect, greedy)
+    assert evaluation.expected_outcome(perfect, greedy) is result
+    assert len(searches) == 1
+    # Other pairs, and pairs with a stochastic policy, are searched.
+    evaluation.expected_outcome(greedy, perfect)
+    assert len(searches) == 2
+    explorer = evaluation.brain_policy(planned_brain(), 0.1)
+    evaluation.expected_outcome(perfect, explorer)
+    evaluation.expected_outcome(perfect, explorer)
+    assert len(searches) == 4
@@ -0,0 +1,31 @@
+import math
+
+import oxlearn.board as ob
+import oxlearn.training.exploration as oe
+
+
+def test_linear():
+    schedule = oe.make_schedule("linear", 0.5, 0.1, 100)
+    assert schedule.rate(0, 0) == 0.5
+    assert math.isclose(schedule.rate(50, 0), 0.3)
+    assert math.isclose(schedule.rate(500, 0), 0.1)
+
+
+def test_exponential():
+    schedule = oe.make_schedule("exponential", 0.5, 0.1, 100)
+    assert schedule.rate(0, 0) == 0.5
+    assert math.isclose(schedule.rate(100, 0), 0.1 + 0.4 / math.e)
+    assert schedule.rate(10000, 0) < 0.1 + 1e-9
+
+
+def test_count_shares_symmetric_states():
+    schedule = oe.make_schedule("count", 0.8, 0.05, 0)
+    corner = (ob.Board(0) + 0).encoded
+    other_corner = (ob.Board(0) + 8).encoded
+    assert schedule.rate(0, corner) == 0.8
+    for _ in range(3):
+        schedule.visit(corner)
+    assert math.isclose(schedule.rate(0, other_corner), 0.4)
+    for _ in range(10000):
+        schedule.visit(corner)
+    assert schedule.rate(0, corner) == 0.05
@@ -0,0 +1,30 @@
+import array
+import random
+
+from oxlearn.board import Board
+from oxlearn.solver import solve
+from oxlearn.training import LearnPlayerBrain
+
+
+def test_batch_moves():
+    brain = LearnPlayerBrain(None, None)
+    rng = random.Random(5)
+    for canon_code in brain.canonical_codes():
+        # Coarse values so there are plenty of ties to break.
+        brain.set_value(canon_code, rng.choice([0.0, 0.5, 1.0]))
+
+    codes = array.array("l", solve().reachable())
+    moves = brain.get_moves(codes)
+    values = brain.move_values(codes)
+    for code, move, row in zip(codes, moves, values):
+        board = Board(code)
+        if board.game_over:
+            assert move is None
+            assert row == [None] * Board.size
+            continue
+        assert move == brain.get_move(code)
+        for pos in Board.all_positions():
+            if pos in board.available_positions:
+                assert row[pos] == brain.value((board + pos).encoded)
+            else:
+                assert row[pos] is None
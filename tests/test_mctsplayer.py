@@ -0,0 +1,39 @@
+import oxlearn.board as ob
+import oxlearn.rng as orng
+from oxlearn.mctsplayer import MCTSPlayer
+from oxlearn.perfectplayer import PerfectPlayer
+from oxlearn.play import play_game
+
+
+def test_takes_win():
+    # O O .
+    # X X .
+    # . . .
+    board = ob.Board(0) + 0 + 3 + 1 + 4
+    player = MCTSPlayer(
+        ob.BoardSymbol.O, rng=orng.SeedSequence(0).generator(), mcts_iterations=200
+    )
+    assert player.move(board) == 2
+
+
+def test_holds_draw_against_perfect():
+    seed = orng.SeedSequence(2)
+    for i, reuse in enumerate([False, True]):
+        player = MCTSPlayer(
+            ob.BoardSymbol.X,
+            rng=seed.child(i).generator(),
+            mcts_iterations=1000,
+            mcts_reuse=reuse,
+        )
+        assert play_game(PerfectPlayer(ob.BoardSymbol.O), player).winner is None
+
+
+def test_budget_stops_search():
+    player = MCTSPlayer(
+        ob.BoardSymbol.O,
+        rng=orng.SeedSequence(3).generator(),
+        mcts_iterations=None,
+        mcts_budget_ms=20,
+    )
+    player.move(ob.Board(0))
+    assert player.last_iterations > 0
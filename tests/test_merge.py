@@ -0,0 +1,72 @@
+import json
+
+import pytest
+
+from oxlearn.training import LearnPlayerBrain
+from oxlearn.training.merge import merge_brains
+
+
+def test_count_visits(tmp_path):
+    path = tmp_path / "brain.json"
+    brain = LearnPlayerBrain(None, str(path), count_visits=True)
+    brain.set_value(1, 0.5)
+    brain.set_value(1, 0.6)
+    brain.set_value(3, 0.2)
+    assert brain.visits == {1: 2, 3: 1}
+    brain.save()
+    assert json.loads(path.read_text())["visits"] == {"1": 2, "3": 1}
+
+    # Counts carry on from a saved brain.
+    loaded = LearnPlayerBrain(str(path), None)
+    loaded.set_value(3, 0.3)
+    assert loaded.visits == {1: 2, 3: 2}
+    assert loaded.valuations == {1: 0.6, 3: 0.3}
+
+    assert LearnPlayerBrain(None, None).visits is None
+
+
+def _save(path, values, visits=None):
+    brain = LearnPlayerBrain(None, str(path), count_visits=visits is not None)
+    brain.valuations.update(values)
+    if visits is not None:
+        brain.visits.update(visits)
+    brain.save()
+    return str(path)
+
+
+def test_merge_brains(tmp_path):
+    a = _save(tmp_path / "a.json", {1: 0.2, 3: 0.8}, {1: 3, 3: 1, 5: 2})
+    b = _save(tmp_path / "b.json", {1: 0.6, 5: 0.9}, {1: 1, 5: 2})
+    output = str(tmp_path / "out.json")
+
+    merged = merge_brains([a, b], output)
+    assert merged.valuations[1] == pytest.approx(0.3)
+    assert merged.valuations[3] == pytest.approx(0.8)
+    # a counted visits to 5 but saved no value, so held about zero there.
+    assert merged.valuations[5] == pytest.approx(0.45)
+    assert merged.visits == {1: 4, 3: 1, 5: 4}
+    loaded = LearnPlayerBrain(output, None)
+    assert loaded.valuations == merged.valuations
+    assert loaded.visits == merged.visits
+
+    best = merge_brains([a, b], output, method="best")
+    # Ties go to the earlier file.
+    assert best.valuations == {1: 0.2, 3: 0.8, 5: 0.0}
+    assert best.visits == {1: 3, 3: 1, 5: 2}
+
+    # Brains saved without counts weigh one visit per state.
+    c = _save(tmp_path / "c.json", {1: 0.9})
+    assert merge_brains([a, c], output).valuations[1] == pytest.approx(0.375)
+
+
+def test_merge_quantized(tmp_path):
+    a = tmp_path / "a.json"
+    brain = LearnPlayerBrain(None, str(a), storage="float16", count_visits=True)
+    brain.set_value(1, 0.5)
+    brain.save()
+    output = str(tmp_path / "out.json")
+    merged = merge_brains([str(a), str(a)], output)
+    saved = json.loads((tmp_path / "out.json").read_text())
+    assert saved["quantization"] == "float16"
+    assert merged.valuations[1] == 0.5
+    assert merged.visits == {1: 2}
@@ -0,0 +1,97 @@
+import json
+
+import pytest
+
+import oxlearn.training
+
+from oxlearn.rng import SeedSequence
+from oxlearn.training import LearnPlayerBrain
+from oxlearn.training import SnapshotPublisher
+from oxlearn.training import TrainingMetrics
+from oxlearn.training import training_routine
+
+player_args = {
+    "exploration_rate": 0.3,
+    "learn_rate": 0.2,
+    "decay_rate": 0.9,
+    "o_reward_win": 1.0,
+    "o_reward_loss": 0.0,
+    "o_reward_draw": 0.1,
+    "x_reward_win": 1.0,
+    "x_reward_loss": 0.0,
+    "x_reward_draw": 0.5,
+}
+
+
+def test_training_metrics(tmp_path):
+    path = tmp_path / "metrics.jsonl"
+    brain = LearnPlayerBrain(None, None)
+    snapshots = SnapshotPublisher(brain, every_games=100)
+    metrics = TrainingMetrics(
+        brain,
+        every_games=100,
+        output_file=str(path),
+        optimality=True,
+        snapshots=snapshots,
+    )
+    training_routine(
+        250,
+        brain,
+        seed=SeedSequence(4),
+        metrics=metrics,
+        snapshots=snapshots,
+        **player_args,
+    )
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    # Two full windows and the remainder at the end.
+    assert [r["games"] for r in records] == [100, 200, 250]
+    assert [r["window_games"] for r in records] == [100, 100, 50]
+    for record in records:
+        assert record["o_rate"] + record["x_rate"] + record["draw_rate"] == (
+            pytest.approx(1.0)
+        )
+        assert record["games_per_sec"] > 0
+        assert record["moves_per_sec"] >= 5 * record["games_per_sec"]
+        assert record["updated_entries"] > 0
+        assert 0 < record["mean_abs_change"] <= record["max_abs_change"]
+        assert 0.0 <= record["optimal_rate"] <= 1.0
+        assert record["blunders"] >= 0
+        assert record["snapshot_lag_games"] == 0
+    assert [r["snapshot_version"] for r in records] == [2, 3, 4]
+
+
+def test_training_metrics_windows_by_time(tmp_path):
+    path = tmp_path / "metrics.jsonl"
+    brain = LearnPlayerBrain(None, None)
+    metrics = TrainingMetrics(brain, every_seconds=3600.0, output_file=str(path))
+    training_routine(20, brain, seed=SeedSequence(4), metrics=metrics, **player_args)
+    # Nothing was due, so the only window is the one closed at the end.
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [(r["games"], r["window_games"]) for r in records] == [(20, 20)]
+    assert "optimal_rate" not in records[0]
+    assert "snapshot_version" not in records[0]
+
+
+def test_training_metrics_closed_on_interrupt(tmp_path, monkeypatch):
+    path = tmp_path / "metrics.jsonl"
+    brain = LearnPlayerBrain(None, None)
+    metrics = TrainingMetrics(brain, every_games=100, output_file=str(path))
+    play_game = oxlearn.training._play_game
+    games = []
+
+    def interrupted(player_o, player_x):
+        if len(games) == 30:
+            raise KeyboardInterrupt
+        games.append(None)
+        return play_game(player_o, player_x)
+
+    monkeypatch.setattr(oxlearn.training, "_play_game", interrupted)
+    with pytest.raises(KeyboardInterrupt):
+        training_routine(
+            100, brain, seed=SeedSequence(4), metrics=metrics, **player_args
+        )
+    # The partial window was written out and the file closed.
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [(r["games"], r["window_games"]) for r in records] == [(30, 30)]
+    assert metrics._output is None
+    assert brain._trackers == []
@@ -0,0 +1,83 @@
+import json
+import math
+
+import oxlearn.board as ob
+from oxlearn.play import play_game
+from oxlearn.training import LearnPlayerBrain
+from oxlearn.training import RewardModel
+from oxlearn.training import TrainedPlayer
+from oxlearn.training import value_iteration
+from oxlearn.training import planning
+
+
+def reward_model(**kwargs) -> RewardModel:
+    rewards = {
+        "decay_rate": 0.9,
+        "o_reward_win": 1.0,
+        "o_reward_loss": 0.0,
+        "o_reward_draw": 0.1,
+        "x_reward_win": 1.0,
+        "x_reward_loss": 0.0,
+        "x_reward_draw": 0.5,
+    }
+    rewards.update(kwargs)
+    return RewardModel(**rewards)
+
+
+def test_fixed_point():
+    brain = LearnPlayerBrain(None, None)
+    model = reward_model(exploration_rate=0.1)
+    assert value_iteration(brain, model) <= 3
+    for canon_code in brain.canonical_codes()[::17]:
+        if canon_code:
+            value = planning.backup(brain, model, canon_code)
+            assert math.isclose(value, brain.value(canon_code), abs_tol=1e-12)
+
+    # O O O
+    # X X .
+    # . . .
+    won = ob.Board(0) + 0 + 3 + 1 + 4 + 2
+    assert math.isclose(brain.value(won.encoded), 0.9)
+
+
+def test_brain_file_loads(tmp_path):
+    file = str(tmp_path / "brain.json")
+    brain = LearnPlayerBrain(None, file)
+    value_iteration(brain, reward_model(exploration_rate=0.1))
+    brain.save()
+    with open(file) as f:
+        assert all(isinstance(v, float) for v in json.load(f).values())
+
+    loaded = LearnPlayerBrain(file, None)
+    result = play_game(
+        TrainedPlayer(ob.BoardSymbol.O, loaded), TrainedPlayer(ob.BoardSymbol.X, loaded)
+    )
+    assert result.winner is None
+
+
+def test_dependents():
+    table = planning._canonical_table()
+    # O O O
+    # X X .
+    # . . .
+    won = (ob.Board(0) + 0 + 3 + 1 + 4 + 2).encoded
+    canon_code = table[won][0]
+    parent = table[(ob.Board(0) + 0 + 3 + 1 + 4).encoded][0]
+    grandparent = table[(ob.Board(0) + 0 + 3 + 1).encoded][0]
+    assert parent in planning.dependents(canon_code)
+    assert grandparent in planning.dependents(canon_code)
+    assert 0 not in planning.dependents(table[(ob.Board(0) + 4).encoded][0])
+
+
+def test_prioritized_sweeping_backs_up_dependents():
+    model = reward_model(exploration_rate=0.3)
+    brain = LearnPlayerBrain(None, None)
+    sweeper = planning.PrioritizedSweeper(model, backups_per_game=50)
+    sweeper.start(brain)
+    history = [(ob.Board(0) + 0).encoded, (ob.Board(0) + 0 + 3 + 1).encoded]
+    history.append((ob.Board(0) + 0 + 3 + 1 + 4 + 2).encoded)
+    brain.learn(history, 1.0, 0.5, 0.9)
+    assert len(sweeper) > 0
+    assert sweeper.sweep() > 0
+    sweeper.close()
+    assert sweeper.backups > 0
@@ -0,0 +1,104 @@
+import oxlearn.board as ob
+import oxlearn.rng as orng
+import oxlearn.training as otr
+import oxlearn.training.replay as orp
+
+from oxlearn.play import play_game
+
+
+def test_round_trip_and_wrap():
+    buffer = orp.ReplayBuffer(2)
+    buffer.add([0, 4, 8], None)
+    buffer.add([4, 0, 1, 2, 7], ob.BoardSymbol.O, sides=(ob.BoardSymbol.X,))
+    assert len(buffer) == 2
+    assert buffer.moves(1) == [4, 0, 1, 2, 7]
+    assert buffer.winner(1) == ob.BoardSymbol.O
+    assert buffer.sides(1) == [ob.BoardSymbol.X]
+
+    index = buffer.add([2], ob.BoardSymbol.X)
+    assert index == 0
+    assert len(buffer) == 2
+    assert buffer.moves(0) == [2]
+    assert buffer.winner(0) == ob.BoardSymbol.X
+    assert buffer.sides(0) == [ob.BoardSymbol.O, ob.BoardSymbol.X]
+
+
+def test_histories():
+    buffer = orp.ReplayBuffer(1)
+    buffer.add([4, 0, 8], None)
+    histories = buffer.histories(0)
+    board = ob.Board(0) + 4
+    assert histories[ob.BoardSymbol.O] == [board.encoded, (board + 0 + 8).encoded]
+    assert histories[ob.BoardSymbol.X] == [(board + 0).encoded]
+
+
+def test_prioritized_sampling():
+    buffer = orp.ReplayBuffer(3)
+    for _ in range(3):
+        buffer.add([0], None)
+    buffer.update_priority(0, 0.0)
+    buffer.update_priority(1, 0.0)
+    rng = orng.SeedSequence(0).generator()
+    samples = buffer.sample(100, rng, prioritized=True)
+    assert samples.count(2) > 90
+
+
+player_args = {
+    "exploration_rate": 0.0,
+    "learn_rate": 0.5,
+    "decay_rate": 0.9,
+    "td_lambda": 0.5,
+    "o_reward_win": 1.0,
+    "o_reward_loss": 0.0,
+    "o_reward_draw": 0.1,
+    "x_reward_win": 1.0,
+    "x_reward_loss": 0.0,
+    "x_reward_draw": 0.5,
+}
+
+
+def _players(learner, brain, seed):
+    return {
+        symbol: learner(
+            symbol, brain=brain, rng=seed.child(symbol).generator(), **player_args
+        )
+        for symbol in ob.BoardSymbol
+    }
+
+
+def test_replay_uses_the_learners_update():
+    # Replaying a game makes the same updates as learning from it in play,
+    # with whichever learner is training.
+    for learner in otr.learners.values():
+        played = otr.LearnPlayerBrain(None, None)
+        players = _players(learner, played, orng.SeedSequence(1))
+        result = play_game(players[ob.BoardSymbol.O], players[ob.BoardSymbol.X])
+
+        replayed = otr.LearnPlayerBrain(None, None)
+        buffer = orp.ReplayBuffer(1)
+        buffer.add(result.moves, result.winner)
+        orp.replay(
+            _players(learner, replayed, orng.SeedSequence(2)),
+            buffer,
+            1,
+            rng=orng.SeedSequence(3).generator(),
+        )
+        assert replayed.valuations
+        assert replayed.valuations == played.valuations
+
+
+def test_replay_updates_priorities():
+    brain = otr.LearnPlayerBrain(None, None)
+    players = _players(otr.LearnPlayer, brain, orng.SeedSequence(1))
+    buffer = orp.ReplayBuffer(4)
+    buffer.add([0, 4, 1, 3, 2], ob.BoardSymbol.O)
+    buffer.add([4, 0, 8, 2, 1, 6, 3, 5, 7], None)
+    assert buffer.priority(0) == buffer.priority(1) == 1.0
+    orp.replay(
+        players, buffer, 20, rng=orng.SeedSequence(0).generator(), prioritized=True
+    )
+    assert brain.valuations
+    # Both games were sampled, and their priorities are now the mean change
+    # their last replay made, which shrinks as values settle.
+    assert 0.0 < buffer.priority(0) < 1.0
+    assert 0.0 < buffer.priority(1) < 1.0
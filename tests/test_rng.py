@@ -0,0 +1,29 @@
+import oxlearn.rng as orng
+
+
+def test_children_reproducible():
+    a = orng.SeedSequence(1234)
+    b = orng.SeedSequence(1234)
+    assert a.child(3).generator().block(10) == b.child(3).generator().block(10)
+    assert a.child(0).generate_seed() != a.child(1).generate_seed()
+    assert [c.spawn_key for c in a.spawn(2)] == [(0,), (1,)]
+    assert [c.spawn_key for c in a.spawn(2)] == [(2,), (3,)]
+
+
+def test_block_matches_single_draws():
+    rng_a = orng.BlockRandom(7, block_size=16)
+    rng_b = orng.BlockRandom(7, block_size=16)
+    singles = [rng_a.random() for _ in range(40)]
+    assert rng_b.block(25) + rng_b.block(15) == singles
+
+
+def test_state_round_trip(tmp_path):
+    rng = orng.BlockRandom(99, block_size=8)
+    rng.block(5)
+    file = str(tmp_path / "state.json")
+    orng.save_states(file, {"a": rng})
+    expected = rng.block(20)
+
+    restored = orng.BlockRandom(0)
+    assert orng.load_states(file, {"a": restored})
+    assert restored.block(20) == expected
@@ -0,0 +1,30 @@
+import oxlearn.board as ob
+import oxlearn.rng as orng
+import oxlearn.rollout as orollout
+
+
+def test_random_play_rates():
+    rng = orng.SeedSequence(0).generator()
+    result = orollout.rollouts(0, 20000, rng)
+    assert result.games == 20000
+    # Random against random: O wins about 58.5%, X 28.8%, draws 12.7%.
+    assert abs(result.o_wins / result.games - 0.585) < 0.02
+    assert abs(result.x_wins / result.games - 0.288) < 0.02
+
+
+def test_terminal_and_batch():
+    rng = orng.SeedSequence(1).generator()
+    # O O O
+    # X X .
+    # . . .
+    won = (ob.Board(0) + 0 + 3 + 1 + 4 + 2).encoded
+    results = orollout.batch_rollouts([won, 0], 10, rng)
+    assert results[0] == orollout.RolloutResult(10, 0, 0)
+    assert results[0].score(ob.BoardSymbol.X) == 0.0
+    assert results[1].games == 10
+
+
+def test_reproducible():
+    a = orollout.rollouts(0, 1000, orng.SeedSequence(5).generator())
+    b = orollout.rollouts(0, 1000, orng.SeedSequence(5).generator())
+    assert a == b
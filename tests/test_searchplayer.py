@@ -0,0 +1,39 @@
+import oxlearn.board as ob
+import oxlearn.rng as orng
+import oxlearn.searchplayer as osp
+from oxlearn.perfectplayer import PerfectPlayer
+from oxlearn.play import play_game
+from oxlearn.randomplayer import RandomPlayer
+
+
+def test_takes_win():
+    # O O .
+    # X X .
+    # . . .
+    board = ob.Board(0) + 0 + 3 + 1 + 4
+    player = osp.SearchPlayer(ob.BoardSymbol.O, search_budget_ms=1000)
+    assert player.move(board) == 2
+    assert player.stats["nodes"] > 0
+
+
+def test_draws_perfect_and_beats_random():
+    search = osp.SearchPlayer(ob.BoardSymbol.X, search_budget_ms=1000)
+    assert play_game(PerfectPlayer(ob.BoardSymbol.O), search).winner is None
+
+    rng = orng.SeedSequence(1).generator()
+    search = osp.SearchPlayer(ob.BoardSymbol.O, search_budget_ms=1000)
+    for _ in range(20):
+        result = play_game(search, RandomPlayer(ob.BoardSymbol.X, rng=rng))
+        assert result.winner != ob.BoardSymbol.X
+    assert search.stats["tt_hit_rate"] > 0
+
+
+def test_replacement_policy():
+    tt = osp.TranspositionTable(4)
+    tt.store(1, 5, 0, tt.EXACT, 4)
+    tt.store(5, 2, 0, tt.EXACT, 0)
+    assert tt.probe(1).depth == 5
+    tt.generation += 1
+    tt.store(5, 2, 0, tt.EXACT, 0)
+    assert tt.probe(1) is None
+    assert tt.probe(5).depth == 2
@@ -0,0 +1,69 @@
+import asyncio
+
+from oxlearn.board import Board
+from oxlearn.server import LatencyStats
+from oxlearn.server import MoveServer
+from oxlearn.training import LearnPlayerBrain
+
+
+def test_latency_stats():
+    stats = LatencyStats(capacity=10)
+    assert stats.percentiles(50) == [0.0]
+    for i in range(20):
+        stats.add(float(i))
+    assert stats.percentiles(0, 50, 100) == [10.0, 15.0, 19.0]
+
+
+def test_move_server():
+    brain = LearnPlayerBrain(None, None)
+    server = MoveServer(brain)
+
+    async def session(codes: list[int]) -> list[bytes]:
+        reader, writer = await asyncio.open_connection(*server.address)
+        # Pipelined: every request goes out before any reply is read.
+        writer.write(b"".join(b"MOVE %d\n" % code for code in codes))
+        writer.write(b"MOVE %d %d %d\nMOVE 2\nbogus\n" % tuple(codes[:3]))
+        await writer.drain()
+        replies = [await reader.readline() for _ in range(len(codes) + 3)]
+        writer.write(b"QUIT\n")
+        await writer.drain()
+        assert await reader.read() == b""
+        writer.close()
+        return replies
+
+    async def run() -> None:
+        await server.start("127.0.0.1", 0)
+        codes = [0, (Board(0) + 4).encoded, (Board(0) + 4 + 0).encoded, 1]
+        results = await asyncio.gather(*(session(codes) for _ in range(50)))
+        for replies in results:
+            for code, reply in zip(codes, replies):
+                assert reply == b"OK %d\n" % brain.greedy_move(code)
+            assert replies[-3] == b"OK %d %d %d\n" % tuple(
+                brain.greedy_move(code) for code in codes[:3]
+            )
+            assert replies[-2].startswith(b"ERR")
+            assert replies[-1].startswith(b"ERR")
+        assert server.requests == 50 * 7
+        assert server.stats().startswith("STATS requests=350")
+
+    asyncio.run(run())
+
+
+def test_move_server_line_limit():
+    brain = LearnPlayerBrain(None, None)
+    server = MoveServer(brain)
+
+    async def run() -> bytes:
+        await server.start("127.0.0.1", 0)
+        reader, writer = await asyncio.open_connection(*server.address)
+        # Just over the limit, so the server has read everything sent when
+        # it closes the connection.
+        writer.write(b"MOVE 0\n" + b"1" * ((1 << 16) + 1))
+        await writer.drain()
+        replies = await reader.read()
+        writer.close()
+        return replies
+
+    # Requests before the long line are still answered.
+    replies = asyncio.run(run())
+    assert replies == b"OK %d\nERR request too long\n" % brain.greedy_move(0)
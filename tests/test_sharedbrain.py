@@ -0,0 +1,70 @@
+import multiprocessing
+
+import pytest
+
+from oxlearn.solver import solve
+from oxlearn.training import LearnPlayerBrain
+from oxlearn.training import SharedBrain
+from oxlearn.training import SharedBrainPublisher
+from oxlearn.training import RewardModel
+from oxlearn.training import value_iteration
+from oxlearn.training.dihedral import canonical_table
+
+
+def _read_moves(name: str, codes: list[int], queue: multiprocessing.Queue) -> None:
+    shared = SharedBrain(name)
+    queue.put((shared.version, shared.get_moves(codes)))
+    shared.close()
+
+
+def test_shared_brain():
+    brain = LearnPlayerBrain(None, None)
+    publisher = SharedBrainPublisher(brain)
+    try:
+        shared = SharedBrain(publisher.name)
+        codes = solve().reachable()
+        assert shared.version == 1
+        assert shared.get_moves(codes) == brain.get_moves(codes)
+        # Readers cannot write to the block.
+        with pytest.raises(TypeError):
+            shared._values[1] = 1.0
+        # Codes that are not boards are rejected rather than read as empty.
+        invalid = next(c for c in range(3**9) if c not in canonical_table())
+        for code in (invalid, 3**9, -1):
+            with pytest.raises(ValueError):
+                shared.get_moves([code])
+            with pytest.raises(ValueError):
+                shared.value(code)
+
+        value_iteration(
+            brain,
+            RewardModel(
+                decay_rate=0.9,
+                o_reward_win=1.0,
+                o_reward_loss=0.0,
+                o_reward_draw=0.1,
+                x_reward_win=1.0,
+                x_reward_loss=0.0,
+                x_reward_draw=0.5,
+            ),
+        )
+        # Readers keep seeing the old version until the next publish.
+        assert shared.value(1) == 0.0
+        assert publisher.publish() == 2
+        assert shared.version == 2
+        assert shared.value(1) == brain.value(1)
+        assert shared.get_moves(codes) == brain.get_moves(codes)
+        shared.close()
+
+        context = multiprocessing.get_context("spawn")
+        queue = context.Queue()
+        process = context.Process(
+            target=_read_moves, args=(publisher.name, codes, queue)
+        )
+        process.start()
+        version, moves = queue.get(timeout=60)
+        process.join()
+        assert version == 2
+        assert moves == brain.get_moves(codes)
+    finally:
+        publisher.close()
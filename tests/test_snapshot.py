@@ -0,0 +1,45 @@
+import pytest
+
+from oxlearn.rng import SeedSequence
+from oxlearn.solver import solve
+from oxlearn.training import LearnPlayerBrain
+from oxlearn.training import SnapshotPublisher
+from oxlearn.training import training_routine
+
+
+def test_snapshots():
+    brain = LearnPlayerBrain(None, None)
+    snapshots = SnapshotPublisher(brain, every_games=100)
+    published = []
+    snapshots.add_listener(published.append)
+    training_routine(
+        250,
+        brain,
+        seed=SeedSequence(2),
+        snapshots=snapshots,
+        exploration_rate=0.3,
+        learn_rate=0.2,
+        decay_rate=0.9,
+        o_reward_win=1.0,
+        o_reward_loss=0.0,
+        o_reward_draw=0.1,
+        x_reward_win=1.0,
+        x_reward_loss=0.0,
+        x_reward_draw=0.5,
+    )
+    # At the start, after 100 and 200 games, and the remainder at the end.
+    assert [s.version for s in published] == [1, 2, 3, 4]
+    assert [s.games for s in published] == [0, 100, 200, 250]
+    assert published[0].valuations == {}
+    assert snapshots.snapshot is published[-1]
+    assert snapshots.snapshot.valuations == brain.valuations
+    assert snapshots.snapshot.valuations is not brain.valuations
+
+    codes = solve().reachable()
+    assert snapshots.snapshot.get_moves(codes) == brain.get_moves(codes)
+    with pytest.raises(TypeError):
+        snapshots.snapshot.set_value(1, 0.5)
+
+    stats = snapshots.stats()
+    assert stats["snapshot_version"] == 4
+    assert stats["snapshot_lag_games"] == 0
@@ -0,0 +1,44 @@
+import oxlearn.board as ob
+import oxlearn.rng as orng
+import oxlearn.solver as osolver
+from oxlearn.perfectplayer import PerfectPlayer
+from oxlearn.play import play_game
+from oxlearn.randomplayer import RandomPlayer
+
+
+def test_known_values():
+    solution = osolver.solve()
+    assert len(solution.reachable()) == 5478
+    assert solution.outcome(0) == osolver.Outcome.DRAW
+    assert solution.distance(0) == 9
+    corner = (ob.Board(0) + 0).encoded
+    assert solution.optimal_moves(corner) == [4]
+    # O . .
+    # . X .
+    # . . .   O to move, taking the opposite corner keeps the draw.
+    assert 8 in solution.optimal_moves((ob.Board(corner) + 4).encoded)
+
+
+def test_fastest_win():
+    # O O .
+    # X X .
+    # . . .   O to move wins at once, X would win next move anyway.
+    board = ob.Board(0) + 0 + 3 + 1 + 4
+    solution = osolver.solve()
+    assert solution.outcome(board.encoded) == osolver.Outcome.WIN
+    assert solution.distance(board.encoded) == 1
+    assert solution.best_moves(board.encoded) == [2]
+
+
+def test_perfect_player_never_loses():
+    rng = orng.SeedSequence(0).generator()
+    result = play_game(PerfectPlayer(ob.BoardSymbol.O), PerfectPlayer(ob.BoardSymbol.X))
+    assert result.winner is None
+    for i in range(200):
+        perfect = PerfectPlayer(ob.BoardSymbol.O if i % 2 else ob.BoardSymbol.X)
+        opponent = RandomPlayer(perfect.symbol.next, rng=rng)
+        if perfect.symbol == ob.BoardSymbol.O:
+            result = play_game(perfect, opponent)
+        else:
+            result = play_game(opponent, perfect)
+        assert result.winner != opponent.symbol
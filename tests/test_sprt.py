@@ -0,0 +1,42 @@
+from oxlearn.rng import SeedSequence
+from oxlearn.sprt import SPRT
+from oxlearn.sprt import elo_difference
+from oxlearn.sprt import expected_score
+from oxlearn.sprt import sprt_match
+from oxlearn.tournament import MatchResult
+from oxlearn.tournament import PlayerSpec
+
+
+def test_elo_score():
+    assert expected_score(0.0) == 0.5
+    assert abs(elo_difference(expected_score(120.0)) - 120.0) < 1e-9
+
+
+def test_sprt_bounds():
+    test = SPRT(0.0, 50.0)
+    assert test.decision is None
+    for _ in range(1000):
+        test.add(MatchResult(1, 0, 0))
+        test.add(MatchResult(0, 0, 1))
+        if test.decision is not None:
+            break
+    assert test.decision == SPRT.H0
+
+    test = SPRT(0.0, 50.0)
+    test.add(MatchResult(0, 1, 0))
+    assert test.decision is None
+
+
+def test_sprt_match():
+    random_spec = PlayerSpec.parse("random")
+    perfect_spec = PlayerSpec.parse("perfect")
+    test = SPRT(0.0, 50.0)
+    result = sprt_match(perfect_spec, random_spec, test, seed=SeedSequence(1))
+    assert result.decision == SPRT.H1
+    assert result.games < 50
+    assert result.result.losses == 0
+
+    test = SPRT(0.0, 50.0)
+    result = sprt_match(perfect_spec, perfect_spec, test, seed=SeedSequence(1))
+    assert result.decision == SPRT.H0
+    assert result.result.draws == result.games
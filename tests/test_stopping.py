@@ -0,0 +1,67 @@
+from oxlearn.rng import SeedSequence
+from oxlearn.training import LearnPlayerBrain
+from oxlearn.training import StoppingCriterion
+from oxlearn.training import training_routine
+
+
+def _windows(stopping, brain, changes):
+    # Runs one window of two games per change, setting a value by that much in
+    # each, and returns the number of windows run when it stopped.
+    stopping.start(brain)
+    for window, change in enumerate(changes, 1):
+        for _ in range(2):
+            if change is not None:
+                brain.set_value(1, brain.value(1) + change)
+            if stopping.should_stop():
+                return window
+    return None
+
+
+def test_stop_on_max_update():
+    stopping = StoppingCriterion(window=2, max_update=0.01)
+    assert _windows(stopping, LearnPlayerBrain(None, None), [0.1, 0.02, 0.005]) == 3
+    assert stopping.reason.startswith("max update")
+
+
+def test_stop_on_mean_update():
+    stopping = StoppingCriterion(window=2, mean_update=0.01)
+    assert _windows(stopping, LearnPlayerBrain(None, None), [0.1, 0.005]) == 2
+    assert stopping.reason.startswith("mean update")
+
+
+def test_no_updates_do_not_stop():
+    stopping = StoppingCriterion(window=2, max_update=0.01, mean_update=0.01)
+    brain = LearnPlayerBrain(None, None)
+    assert _windows(stopping, brain, [None, None, 0.1, None]) is None
+    assert stopping.reason is None
+
+
+def test_stop_on_stable_policy():
+    stopping = StoppingCriterion(window=2, policy_stable_windows=2)
+    brain = LearnPlayerBrain(None, None)
+    # The first window sees the policy for the first time, so it takes two
+    # more without a change.
+    assert _windows(stopping, brain, [None] * 5) == 3
+    assert stopping.reason == "greedy policy unchanged for 2 windows"
+
+
+def test_stop_on_time_limit():
+    stopping = StoppingCriterion(max_seconds=0.0)
+    brain = LearnPlayerBrain(None, None)
+    games = training_routine(
+        100,
+        brain,
+        seed=SeedSequence(1),
+        stopping=stopping,
+        exploration_rate=0.3,
+        learn_rate=0.2,
+        decay_rate=0.9,
+        o_reward_win=1.0,
+        o_reward_loss=0.0,
+        o_reward_draw=0.1,
+        x_reward_win=1.0,
+        x_reward_loss=0.0,
+        x_reward_draw=0.5,
+    )
+    assert games == 1
+    assert stopping.reason.startswith("time limit")
@@ -0,0 +1,205 @@
+import json
+import random
+import threading
+
+import pytest
+
+from oxlearn.rng import SeedSequence
+from oxlearn.solver import solve
+from oxlearn.training import LearnPlayerBrain
+from oxlearn.training import training_routine
+from oxlearn.training.storage import SQLiteStore
+from oxlearn.training.storage import make_store
+
+
+def test_quantized_stores():
+    for name, tolerance in (("float32", 1e-7), ("float16", 1e-3), ("uint16", 1e-4)):
+        store = make_store(name, rng=random.Random(0))
+        assert len(store) == 0
+        assert store.get(1, 0.0) == 0.0
+        store[1] = 0.3
+        store[3] = -0.7
+        assert len(store) == 2
+        assert sorted(store) == [1, 3]
+        assert abs(store[1] - 0.3) < tolerance
+        assert abs(store[3] + 0.7) < tolerance
+        with pytest.raises(KeyError):
+            store[2] = 0.5
+        del store[1]
+        assert 1 not in store
+        assert len(store) == 1
+
+
+def test_missing_codes():
+    for name in ("float32", "float16", "uint16"):
+        store = make_store(name, rng=random.Random(0))
+        # 2 is not canonical, and 3**9 is past the last board code.
+        for code in (2, 3**9, -1):
+            assert store.get(code, 0.5) == 0.5
+            assert code not in store
+            with pytest.raises(KeyError):
+                store[code]
+            with pytest.raises(KeyError):
+                del store[code]
+        with pytest.raises(KeyError):
+            store[3**9] = 0.5
+
+
+def test_uint16_clamps(caplog):
+    store = make_store("uint16", value_range=(0.0, 1.0), rng=random.Random(0))
+    store[1] = 0.5
+    assert store.clamped == 0
+    store[1] = 1.5
+    store[3] = -0.5
+    assert store[1] == 1.0
+    assert store[3] == 0.0
+    assert store.clamped == 2
+    assert "outside the uint16 storage range" in caplog.text
+
+
+def test_float16_clamps(caplog):
+    store = make_store("float16", rng=random.Random(0))
+    store[1] = 1e6
+    store[3] = -1e6
+    assert store[1] == 65504.0
+    assert store[3] == -65504.0
+    assert store.clamped == 2
+    assert "outside the float16 storage range" in caplog.text
+
+
+def test_stochastic_rounding():
+    # Stochastic rounding is unbiased, so the mean of many roundings of a value
+    # between two representable ones is close to the value itself.
+    for name in ("float16", "uint16"):
+        store = make_store(name, rng=random.Random(1))
+        total = 0.0
+        for _ in range(10000):
+            store[1] = 0.1234567
+            total += store[1]
+        assert abs(total / 10000 - 0.1234567) < 1e-6
+
+
+def test_save_quantization(tmp_path):
+    output = tmp_path / "brain.json"
+    brain = LearnPlayerBrain(None, str(output), storage="uint16")
+    brain.set_value(1, 0.25)
+    brain.save()
+    with open(output) as f:
+        data = json.load(f)
+    assert data["quantization"] == "uint16"
+    assert data["range"] == [-1.0, 1.0]
+
+    loaded = LearnPlayerBrain(str(output), None)
+    assert loaded.valuations.quantization == "uint16"
+    assert loaded.value(1) == brain.value(1)
+
+    converted = LearnPlayerBrain(str(output), str(output), storage="dict")
+    assert converted.value(1) == brain.value(1)
+    converted.save()
+    with open(output) as f:
+        assert "quantization" not in json.load(f)
+
+
+def test_sqlite_store(tmp_path):
+    path = str(tmp_path / "values.db")
+    store = SQLiteStore(path, page_size=16, cache_pages=4, write_batch=2)
+    rng = random.Random(2)
+    expected = {}
+    for _ in range(2000):
+        code = rng.randrange(1000)
+        if code in expected and rng.random() < 0.1:
+            del store[code]
+            del expected[code]
+        else:
+            expected[code] = store[code] = rng.random()
+        assert len(store) == len(expected)
+    assert store.page_writes > 0
+    assert 0.0 < store.hit_rate < 1.0
+    assert all(store.get(code) == value for code, value in expected.items())
+    store.close()
+
+    store = SQLiteStore(path, page_size=16, cache_pages=4)
+    assert len(store) == len(expected)
+    assert dict(store.items()) == expected
+    store.close()
+
+
+def test_sqlite_brain(tmp_path):
+    path = str(tmp_path / "values.db")
+    brain = LearnPlayerBrain(None, None, storage="sqlite", storage_path=path)
+    brain.set_value(1, 0.25)
+    brain.set_value(3, 0.5)
+    brain.save()
+    brain = LearnPlayerBrain(None, None, storage="sqlite", storage_path=path)
+    assert brain.value(1) == 0.25
+    in_memory = LearnPlayerBrain(None, None)
+    in_memory.valuations.update(brain.valuations)
+    codes = solve().reachable()
+    assert brain.get_moves(codes) == in_memory.get_moves(codes)
+
+
+def test_sqlite_copy(tmp_path):
+    store = SQLiteStore(str(tmp_path / "values.db"), page_size=16, cache_pages=4)
+    for code in range(0, 200, 3):
+        store[code] = code / 200
+    copy = store.copy()
+    assert isinstance(copy, SQLiteStore)
+    store[3] = 1.0
+    assert copy[3] == 3 / 200
+    assert len(copy) == len(store)
+    assert dict(copy.items()) == {**dict(store.items()), 3: 3 / 200}
+    copy.close()
+    store.close()
+
+
+def test_sqlite_brain_keeps_database(tmp_path):
+    path = str(tmp_path / "values.db")
+    brain = LearnPlayerBrain(None, None, storage="sqlite", storage_path=path)
+    brain.set_value(1, 0.25)
+    brain.save()
+    input_file = tmp_path / "brain.json"
+    input_file.write_text(json.dumps({"1": 0.75, "3": 0.5}))
+    brain = LearnPlayerBrain(str(input_file), None, storage="sqlite", storage_path=path)
+    assert dict(brain.valuations.items()) == {1: 0.25}
+
+    empty = str(tmp_path / "empty.db")
+    brain = LearnPlayerBrain(
+        str(input_file), None, storage="sqlite", storage_path=empty
+    )
+    assert dict(brain.valuations.items()) == {1: 0.75, 3: 0.5}
+
+
+def test_sqlite_brain_in_thread(tmp_path):
+    # As with --serve and --training, the brain is made in one thread and
+    # trained in another.
+    path = str(tmp_path / "values.db")
+    output = tmp_path / "brain.json"
+    brain = LearnPlayerBrain(None, str(output), storage="sqlite", storage_path=path)
+    errors = []
+
+    def train():
+        try:
+            training_routine(
+                200,
+                brain,
+                seed=SeedSequence(3),
+                exploration_rate=0.3,
+                learn_rate=0.2,
+                decay_rate=0.9,
+                o_reward_win=1.0,
+                o_reward_loss=0.0,
+                o_reward_draw=0.1,
+                x_reward_win=1.0,
+                x_reward_loss=0.0,
+                x_reward_draw=0.5,
+            )
+        except Exception as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=train)
+    thread.start()
+    thread.join()
+    assert errors == []
+    saved = json.loads(output.read_text())
+    assert saved
+    assert saved == {str(k): v for k, v in brain.valuations.items() if v > 1e-5}
@@ -0,0 +1,59 @@
+import oxlearn.rng as orng
+import oxlearn.training.sweep as osweep
+
+
+def test_grid_configurations():
+    spec = {"grid": {"learn_rate": [0.1, 0.2], "decay_rate": [0.8, 0.9, 1.0]}}
+    base = {"learn_rate": 0.5, "exploration_rate": 0.3}
+    configs = osweep.configurations(spec, base, orng.SeedSequence(0))
+    assert len(configs) == 6
+    assert all(c["exploration_rate"] == 0.3 for c in configs)
+    assert {(c["learn_rate"], c["decay_rate"]) for c in configs} == {
+        (lr, dr) for lr in [0.1, 0.2] for dr in [0.8, 0.9, 1.0]
+    }
+
+
+def test_random_configurations():
+    spec = {"random": {"samples": 5, "learn_rate": [0.1, 0.2]}}
+    a = osweep.configurations(spec, {}, orng.SeedSequence(4))
+    b = osweep.configurations(spec, {}, orng.SeedSequence(4))
+    assert a == b
+    assert len(a) == 5
+    assert all(0.1 <= c["learn_rate"] <= 0.2 for c in a)
+
+
+def test_run_sweep(tmp_path):
+    base = {
+        "exploration_rate": 0.3,
+        "exploration_final": 0.0,
+        "exploration_decay_games": 100,
+        "learn_rate": 0.2,
+        "decay_rate": 0.9,
+        "td_lambda": 0.0,
+        "o_reward_win": 1.0,
+        "o_reward_loss": 0.0,
+        "o_reward_draw": 0.1,
+        "x_reward_win": 1.0,
+        "x_reward_loss": 0.0,
+        "x_reward_draw": 0.5,
+    }
+    spec = {"grid": {"learn_rate": [0.1, 0.3]}}
+    configs = osweep.configurations(spec, base, orng.SeedSequence(0))
+    results = osweep.run_sweep(configs, 50, seed=orng.SeedSequence(1), workers=2)
+    assert [r["index"] for r in results] == [0, 1]
+    assert [r["config"]["learn_rate"] for r in results] == [0.1, 0.3]
+    for result in results:
+        assert 0.0 <= result["score"] <= 1.0
+        assert 0.0 <= result["optimal"] <= 1.0
+        assert result["values"]
+    again = osweep.run_sweep(configs, 50, seed=orng.SeedSequence(1), workers=1)
+    assert [r["score"] for r in again] == [r["score"] for r in results]
+    assert osweep.best_result(results)["score"] == max(r["score"] for r in results)
+
+    path = tmp_path / "results.csv"
+    osweep.write_results(str(path), results)
+    rows = path.read_text().splitlines()
+    assert rows[0] == ",".join(["index", *osweep.sweep_parameters, "score", "optimal"])
+    assert len(rows) == 3
+    assert rows[1].startswith("0,0.3,0.0,100,0.1,")
+    assert rows[2].split(",")[-2] == str(results[1]["score"])
@@ -0,0 +1,44 @@
+import math
+
+import oxlearn.board as ob
+from oxlearn.training import LearnPlayerBrain
+from oxlearn.training import TDLearnPlayer
+
+
+class ScriptedRng:
+    def __init__(self, moves):
+        self._moves = list(moves)
+
+    def random(self):
+        return 0.0
+
+    def choice(self, seq):
+        pos = self._moves.pop(0)
+        assert pos in seq
+        return pos
+
+
+def test_td_updates_with_traces():
+    brain = LearnPlayerBrain(None, None)
+    player = TDLearnPlayer(
+        ob.BoardSymbol.O,
+        brain=brain,
+        rng=ScriptedRng([0, 8]),
+        exploration_rate=1.0,
+        learn_rate=0.5,
+        decay_rate=0.9,
+        td_lambda=0.5,
+        o_reward_win=1.0,
+        o_reward_loss=0.0,
+        o_reward_draw=0.1,
+    )
+    first = ob.Board(0) + 0
+    player.move(ob.Board(0))
+    second = first + 4 + 8
+    player.move(first + 4)
+    player.notify_win(second)
+
+    # Values start at zero, so only the final reward moves anything, and the
+    # first afterstate gets it through its trace of decay * lambda.
+    assert math.isclose(brain.value(second.encoded), 0.5 * 0.9)
+    assert math.isclose(brain.value(first.encoded), 0.5 * 0.9 * 0.9 * 0.5)
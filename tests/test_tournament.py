@@ -0,0 +1,40 @@
+from oxlearn.board import BoardSymbol
+from oxlearn.perfectplayer import PerfectPlayer
+from oxlearn.randomplayer import RandomPlayer
+from oxlearn.rng import SeedSequence
+from oxlearn.tournament import MatchResult
+from oxlearn.tournament import PlayerSpec
+from oxlearn.tournament import Tournament
+from oxlearn.tournament import play_match
+from oxlearn.tournament import run_tournament
+
+
+def test_play_match():
+    rng = SeedSequence(1).generator()
+    result = play_match(
+        RandomPlayer(BoardSymbol.O, rng=rng), PerfectPlayer(BoardSymbol.X), 50
+    )
+    assert result.games == 50
+    assert result.wins == 0
+
+
+def test_elo():
+    specs = [PlayerSpec.parse(s) for s in ("random", "perfect", "search")]
+    tournament = Tournament(specs)
+    tournament.add(0, 1, MatchResult(0, 10, 90))
+    tournament.add(2, 0, MatchResult(90, 10, 0))
+    tournament.add(1, 2, MatchResult(0, 100, 0))
+    assert tournament.result(1, 0) == MatchResult(90, 10, 0)
+    ratings = tournament.elo()
+    assert abs(sum(ratings)) < 1e-6
+    assert abs(ratings[1] - ratings[2]) < 1e-3
+    assert ratings[1] - ratings[0] > 300
+
+
+def test_run_tournament():
+    specs = [PlayerSpec.parse("random"), PlayerSpec.parse("perfect")]
+    first = run_tournament(specs, 101, seed=SeedSequence(3), workers=2)
+    second = run_tournament(specs, 101, seed=SeedSequence(3), workers=1)
+    assert first.result(0, 1) == second.result(0, 1)
+    assert first.result(0, 1).games == 101
+    assert first.result(1, 0).losses == 0